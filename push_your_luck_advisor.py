@@ -0,0 +1,119 @@
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional
+
+from push_your_luck_index import numbers_to_mask
+
+SPINNER_SIZE = 13  # Numbers 1-13, as in every game version
+# The advice table's own action order, stored in each row's best-action byte (ties go to banking);
+# not the solver's ACTIONS order
+ADVICE_ACTIONS = ['bank', 'higher', 'lower']
+
+HEADER = struct.Struct('<4sBBxx')  # magic, spinner size, minimum numbers needed to guess
+ROW = struct.Struct('<5fB')  # ev_bank, ev_higher, ev_lower, bust_higher, bust_lower, best action
+MAGIC = b'PYLA'
+
+
+def default_table_file(min_to_guess: int) -> str:
+    return f"push_your_luck_advice_{min_to_guess}.bin"
+
+
+def row_index(target_num: int, mask: int) -> int:
+    """Position of the (target, remaining-mask) state in the table."""
+    return (target_num - 1) * (1 << SPINNER_SIZE) + mask
+
+
+def build_advice_table(filename: str, min_to_guess: int = 2):
+    """Solve every (target, remaining-mask) state of a round and write the table to filename.
+
+    Within a round the bank is always the sum of the numbers already drawn, so
+    (target, mask) determines the bank and the table covers every reachable
+    (bank, target, mask) state. Values are the expected points banked this round
+    under optimal play. min_to_guess is how many numbers must remain to guess:
+    2 for the single player game and the solver (the last number banks
+    automatically), 1 for the mixed game.
+    """
+    full_mask = (1 << SPINNER_SIZE) - 1
+    total = SPINNER_SIZE * (SPINNER_SIZE + 1) // 2
+    mask_sums = [0] * (full_mask + 1)
+    for mask in range(1, full_mask + 1):
+        low_bit = mask & -mask
+        mask_sums[mask] = mask_sums[mask ^ low_bit] + low_bit.bit_length()
+
+    rows = bytearray(ROW.size * SPINNER_SIZE * (full_mask + 1))
+    values: Dict[int, float] = {}  # Optimal round value per table index
+
+    # Fewer remaining numbers first, so every successor is already solved
+    for mask in sorted(range(full_mask + 1), key=lambda m: bin(m).count('1')):
+        remaining = [num for num in range(1, SPINNER_SIZE + 1) if mask >> (num - 1) & 1]
+        for target_num in range(1, SPINNER_SIZE + 1):
+            if mask >> (target_num - 1) & 1:
+                continue
+            bank = total - mask_sums[mask]
+            index = row_index(target_num, mask)
+            if len(remaining) < min_to_guess:
+                # No guess is possible: every choice banks
+                ROW.pack_into(rows, index * ROW.size, bank, bank, bank, 0.0, 0.0, 0)
+                values[index] = bank
+                continue
+
+            ev_higher = sum(values[row_index(num, mask ^ (1 << (num - 1)))]
+                            for num in remaining if num > target_num) / len(remaining)
+            ev_lower = sum(values[row_index(num, mask ^ (1 << (num - 1)))]
+                           for num in remaining if num < target_num) / len(remaining)
+            bust_higher = sum(1 for num in remaining if num < target_num) / len(remaining)
+            bust_lower = sum(1 for num in remaining if num > target_num) / len(remaining)
+
+            evs = [bank, ev_higher, ev_lower]
+            best = max(range(3), key=lambda i: (evs[i], -i))  # Ties go to banking
+            ROW.pack_into(rows, index * ROW.size, bank, ev_higher, ev_lower, bust_higher, bust_lower, best)
+            values[index] = evs[best]
+
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, SPINNER_SIZE, min_to_guess))
+        f.write(rows)
+    os.replace(tmp_filename, filename)
+
+
+class StrategyAdvisor:
+    """Serves precomputed advice for a round state from a memory-mapped table."""
+    def __init__(self, filename: Optional[str] = None, min_to_guess: int = 2):
+        filename = filename or default_table_file(min_to_guess)
+        if not os.path.exists(filename):
+            build_advice_table(filename, min_to_guess)
+
+        with open(filename, 'rb') as f:
+            self.table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, spinner_size, self.min_to_guess = HEADER.unpack_from(self.table, 0)
+        if magic != MAGIC or spinner_size != SPINNER_SIZE:
+            raise ValueError(f"{filename} is not a Push Your Luck advice table")
+
+    def advise(self, bank: int, target_num: int, available_numbers: List[int]) -> Dict[str, object]:
+        """Return the recommended action, bust probabilities and expected values of each option."""
+        offset = HEADER.size + row_index(target_num, numbers_to_mask(available_numbers)) * ROW.size
+        ev_bank, ev_higher, ev_lower, bust_higher, bust_lower, best = ROW.unpack_from(self.table, offset)
+        if bank != ev_bank:
+            # A bank that differs from the drawn numbers' sum (e.g. a custom game): rank the options again
+            evs = [bank, ev_higher, ev_lower]
+            best = max(range(3), key=lambda i: (evs[i], -i))
+        return {
+            'action': ADVICE_ACTIONS[best],
+            'ev_bank': bank,
+            'ev_higher': ev_higher,
+            'ev_lower': ev_lower,
+            'bust_higher': bust_higher,
+            'bust_lower': bust_lower,
+        }
+
+    def close(self):
+        self.table.close()
+
+
+def format_advice(advice: Dict[str, object]) -> str:
+    """Render advice as a one-line hint for the prompt."""
+    return (f"Advisor: {advice['action']} | "
+            f"bank = {advice['ev_bank']} pts, "
+            f"higher = {advice['ev_higher']:.1f} pts ({advice['bust_higher'] * 100:.0f}% bust), "
+            f"lower = {advice['ev_lower']:.1f} pts ({advice['bust_lower'] * 100:.0f}% bust)")
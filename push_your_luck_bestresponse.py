@@ -0,0 +1,506 @@
+"""Best response in the mixed game to fixed, score-independent opponent strategies.
+
+The solver models a heads-up game: us against one opponent strategy. A table
+with several opponents is reduced to those heads-up games rather than solved
+over the joint state, which needs every opponent's score and in-round status
+(target^(n+1) score tuples, each with 2^n in-round cases) and is out of reach
+beyond one opponent. The reduction is sound as a bound: opponents never react
+to scores, so each one's moves on the shared spinner are known regardless of
+the others, and we only win by beating every one of them, so our win
+probability at the table is at most the smallest heads-up one.
+BestResponsePlayer therefore answers, at each decision, the opponent it is
+least likely to beat among those still in the round.
+"""
+
+import argparse
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from push_your_luck_index import mask_to_numbers, numbers_to_mask, RemainingIndex
+from push_your_luck_mixed import Player, MixedPushYourLuckGame
+from push_your_luck_solver import ACTIONS, HIGHER, LOWER, BANK
+from push_your_luck_tournament import make_player
+
+# Set in each worker process by _attach_worker
+_worker: Dict[str, object] = {}
+
+
+class RoundModel:
+    """One round of the mixed game between us and a score-independent opponent strategy.
+
+    In-round states are (target, remaining mask) in the state_index block layout;
+    the bank is implied by the mask and is the same for every player still in
+    the round, since they all guessed every spin correctly. Holds the states
+    grouped by numbers remaining, the opponent's deterministic action in each
+    state, and the distribution of what the opponent banks from each state.
+    """
+    def __init__(self, opponent: str, target_score: int = 100, spinner_size: int = 13, ai_first: bool = True):
+        kind = opponent.partition(':')[0]
+        if kind == 'ai':
+            raise ValueError("Opponent strategies must not depend on scores; 'ai' is not supported")
+        self.opponent = opponent
+        self.target_score = target_score
+        self.spinner_size = spinner_size
+        self.ai_first = ai_first  # Seat order decides who wins when both reach the target on the same spin
+
+        bits = spinner_size - 1
+        self.bits = bits
+        self.size = spinner_size << bits
+        offsets = np.arange(self.size, dtype=np.int64)
+        self.targets = (offsets >> bits) + 1
+        compressed = offsets & ((1 << bits) - 1)
+        low_bits = compressed & ((1 << (self.targets - 1)) - 1)
+        self.masks = low_bits | ((compressed >> (self.targets - 1)) << self.targets)
+        bit_matrix = (self.masks[:, None] >> np.arange(spinner_size)) & 1
+        remaining = bit_matrix.sum(axis=1)
+        self.bank = spinner_size * (spinner_size + 1) // 2 - bit_matrix @ np.arange(1, spinner_size + 1)
+        self.max_bank = int(self.bank.max())
+        # For the state right after a draw, what the bank was before it
+        self.previous_bank = self.bank - self.targets
+        self.start = ((np.arange(spinner_size) << bits) | ((1 << bits) - 1)).astype(np.int64)
+
+        # levels[c] = (states with c numbers remaining, successors (states x c), next number higher?)
+        self.levels: List[Tuple[int, np.ndarray, np.ndarray, np.ndarray]] = []
+        for count in range(spinner_size):
+            states = np.flatnonzero(remaining == count)
+            rows, columns = np.nonzero(bit_matrix[states])
+            numbers = (columns + 1).reshape(len(states), count)
+            new_masks = self.masks[states][:, None] ^ (1 << (numbers - 1))
+            new_compressed = (new_masks & ((1 << (numbers - 1)) - 1)) | ((new_masks >> numbers) << (numbers - 1))
+            successors = ((numbers - 1) << bits) | new_compressed
+            self.levels.append((count, states, successors, numbers > self.targets[states][:, None]))
+
+        self.opponent_actions = self._opponent_actions(make_player(opponent))
+        # Which next numbers the opponent's guess is right about, per level
+        self.opponent_correct = [self._correct(self.opponent_actions[states], higher)
+                                 for _, states, _, higher in self.levels]
+        gains = self._opponent_gains()
+        self.opponent_busts = gains[:, 0]
+        # The rest is sparse: (state, amount, probability) triples
+        self.gain_states, amounts = np.nonzero(gains[:, 1:])
+        self.gain_amounts = amounts + 1
+        self.gain_probabilities = gains[self.gain_states, self.gain_amounts]
+
+    def _opponent_actions(self, player: Player) -> np.ndarray:
+        """The opponent's action in every state; everyone banks once the spinner is empty."""
+        actions = np.full(self.size, BANK, dtype=np.int8)
+        codes = {'higher': HIGHER, 'lower': LOWER, 'bank': BANK}
+        for state in range(self.size):
+            numbers = mask_to_numbers(int(self.masks[state]))
+            if numbers:
+                player.bank = int(self.bank[state])
+                target_num = int(self.targets[state])
+                actions[state] = codes[player.get_guess(target_num, numbers, RemainingIndex(numbers))]
+        return actions
+
+    def _opponent_gains(self) -> np.ndarray:
+        """gains[state, g]: probability the opponent, still in the round at state, ends it banking g (0 for a bust)."""
+        gains = np.zeros((self.size, self.max_bank + 1))
+        for (count, states, successors, _), correct in zip(self.levels, self.opponent_correct):
+            banking = self.opponent_actions[states] == BANK
+            gains[states[banking], self.bank[states[banking]]] = 1.0
+            if count:
+                guessing = ~banking
+                correct = correct[guessing]
+                gains[states[guessing]] = (correct[..., None] * gains[successors[guessing]]).sum(axis=1) / count
+                gains[states[guessing], 0] += (~correct).sum(axis=1) / count
+        return gains
+
+    @staticmethod
+    def _correct(actions: np.ndarray, higher: np.ndarray) -> np.ndarray:
+        """Which next numbers a guess is right about (never for a bank)."""
+        return np.where((actions == HIGHER)[:, None], higher, (actions == LOWER)[:, None] & ~higher)
+
+    def terminal_table(self, values: np.ndarray) -> np.ndarray:
+        """Win probability at the start of a round for any pair of scores, including finished games."""
+        target, size = self.target_score, self.target_score + self.max_bank + 1
+        table = np.zeros((size, size))
+        table[:target, :target] = values
+        table[target:, :target] = 1.0
+        table[target:, target:] = 1.0 if self.ai_first else 0.0
+        return table
+
+    def solo_values(self, table: np.ndarray, score: int, leader_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Our values and best actions once the opponent is out of the round, one column per leader score.
+
+        A bust ends the round with both scores unchanged, so it is worth
+        table[score, leader_score].
+        """
+        columns = len(leader_scores)
+        values = np.zeros((self.size, columns))
+        decisions = np.full((self.size, columns), BANK, dtype=np.int8)
+        bust = table[score, leader_scores]
+        for count, states, successors, higher in self.levels:
+            bank_value = table[(score + self.bank[states])[:, None], leader_scores[None, :]]
+            if not count:
+                values[states] = bank_value
+                continue
+            after = values[successors]
+            options = np.stack([
+                np.where(higher[..., None], after, bust).mean(axis=1),
+                np.where(~higher[..., None], after, bust).mean(axis=1),
+                bank_value,
+            ])
+            decisions[states] = _best(options)
+            values[states] = options.max(axis=0)
+        return values, decisions
+
+    def opponent_continuation(self, table: np.ndarray, score: int, leader_score: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Round values once we are out but the opponent is still in, from each state after a draw.
+
+        Returns (after our bust, after our bank); for the bank, our new score is
+        score plus the bank before that draw. After our bust this leaves out the
+        opponent busting as well, which replays the same score pair: callers add
+        opponent_busts * V(score, leader_score).
+        """
+        leader_scores = leader_score + self.gain_amounts
+        after_bust = np.bincount(self.gain_states, self.gain_probabilities * table[score, leader_scores],
+                                 minlength=self.size)
+        our_scores = score + self.previous_bank[self.gain_states]
+        after_bank = np.bincount(self.gain_states, self.gain_probabilities * table[our_scores, leader_scores],
+                                 minlength=self.size)
+        after_bank += self.opponent_busts * table[score + self.previous_bank, leader_score]
+        return after_bust, after_bank
+
+    def contested_values(self, table: np.ndarray, score: int, leader_score: int, solo: np.ndarray,
+                         entry: np.ndarray, after_bust: np.ndarray, after_bank: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Our values and best actions while the opponent is still in the round.
+
+        solo holds solo_values for this leader score, entry[state] the solo value
+        with the opponent's score raised by the bank it took just before state,
+        and after_bust and after_bank come from opponent_continuation (with the
+        replayed score pair added to after_bust).
+        """
+        target = self.target_score
+        values = np.zeros(self.size)
+        decisions = np.full(self.size, BANK, dtype=np.int8)
+        stay = table[score, leader_score]
+        for (count, states, successors, higher), opponent_correct in zip(self.levels, self.opponent_correct):
+            bank = self.bank[states]
+            opponent_banks = self.opponent_actions[states] == BANK
+            # Both banking (always the case on an empty spinner)
+            bank_value = table[score + bank, leader_score + bank]
+            if not count:
+                values[states] = bank_value
+                continue
+
+            # We bank and the opponent guesses: we win now, or wait for its round to end
+            waiting = np.where(opponent_correct, after_bank[successors], table[score + bank, leader_score][:, None])
+            bank_value = np.where(opponent_banks, bank_value,
+                                  np.where(score + bank >= target, 1.0, waiting.mean(axis=1)))
+
+            options = [bank_value]
+            for we_correct in (higher, ~higher):
+                # The opponent banks as we guess: it may win now, else we play on alone
+                against_bank = np.where(leader_score + bank >= target, 0.0,
+                                        np.where(we_correct, entry[successors],
+                                                 table[score, leader_score + bank][:, None]).mean(axis=1))
+                against_guess = np.where(opponent_correct,
+                                         np.where(we_correct, values[successors], after_bust[successors]),
+                                         np.where(we_correct, solo[successors], stay)).mean(axis=1)
+                options.insert(-1, np.where(opponent_banks, against_bank, against_guess))
+            options = np.stack(options)
+            decisions[states] = _best(options)
+            values[states] = options.max(axis=0)
+        return values, decisions
+
+    def entry_values(self, solo_row: np.ndarray, leader_score: int) -> np.ndarray:
+        """entry argument of contested_values, from solo values for every leader score (one column each)."""
+        raised = leader_score + self.previous_bank
+        entry = np.zeros(self.size)
+        valid = (self.previous_bank > 0) & (raised < self.target_score)
+        entry[valid] = solo_row[np.flatnonzero(valid), raised[valid]]
+        return entry
+
+    def round_value(self, contested: np.ndarray) -> float:
+        """Win probability at the start of a round, over the uniformly drawn first target."""
+        return float(contested[self.start].mean())
+
+
+def _best(options: np.ndarray) -> np.ndarray:
+    """Index into ACTIONS of the best option per state, preferring to bank on ties."""
+    order = [BANK, HIGHER, LOWER]
+    return np.array(order, dtype=np.int8)[np.argmax(options[order], axis=0)]
+
+
+def _solve_pair(model: RoundModel, values: np.ndarray, score: int, leader_score: int,
+                entry: np.ndarray, guess: float) -> Tuple[float, np.ndarray]:
+    """Solve V(score, leader_score) given every later score pair; return it and the final solo column.
+
+    A round in which nobody banks repeats the same score pair, so the value is
+    the fixed point of one round's lookahead; it is found with the secant method
+    (exact once the best actions stop changing, the lookahead is piecewise linear).
+    """
+    leader_scores = np.array([leader_score])
+    # Neither continuation reads this score pair except through the opponent's bust
+    after_bust, after_bank = model.opponent_continuation(model.terminal_table(values), score, leader_score)
+
+    def lookahead(value: float) -> Tuple[float, np.ndarray]:
+        values[score, leader_score] = value
+        table = model.terminal_table(values)
+        solo = model.solo_values(table, score, leader_scores)[0][:, 0]
+        contested = model.contested_values(table, score, leader_score, solo, entry,
+                                           after_bust + model.opponent_busts * value, after_bank)[0]
+        return model.round_value(contested), solo
+
+    previous = guess
+    previous_error = lookahead(previous)[0] - previous
+    value = min(1.0, max(0.0, previous + previous_error))
+    for _ in range(50):
+        result, solo = lookahead(value)
+        error = result - value
+        if abs(error) < 1e-12 or error == previous_error:
+            break
+        previous, previous_error, value = value, error, value - error * (value - previous) / (error - previous_error)
+        value = min(1.0, max(0.0, value))
+    values[score, leader_score] = result
+    return result, solo
+
+
+def _attach_worker(values_name: str, progress_name: str, opponent: str, target_score: int,
+                   spinner_size: int, ai_first: bool):
+    """Map the shared value table and row progress into a worker process and build the round model."""
+    values_memory = shared_memory.SharedMemory(name=values_name)
+    progress_memory = shared_memory.SharedMemory(name=progress_name)
+    _worker['memory'] = (values_memory, progress_memory)  # Keep the mappings alive
+    _worker['values'] = np.ndarray((target_score, target_score), dtype=np.float64, buffer=values_memory.buf)
+    _worker['progress'] = np.ndarray((target_score,), dtype=np.int64, buffer=progress_memory.buf)
+    _worker['model'] = RoundModel(opponent, target_score, spinner_size, ai_first)
+
+
+def _solve_rows(rows: List[int]) -> int:
+    """Solve every leader score for our scores in rows (descending), waiting on higher rows as needed.
+
+    progress[row] is the lowest leader score solved in that row. Pair (m, L)
+    needs rows above m solved down to L, and this row's solo values for higher
+    leader scores, which stay in this process.
+    """
+    model = _worker['model']
+    values = _worker['values']
+    progress = _worker['progress']
+    target = model.target_score
+    for score in rows:
+        solo_row = np.zeros((model.size, target))
+        needed = slice(score + 1, min(target, score + model.max_bank + 1))
+        for leader_score in range(target - 1, -1, -1):
+            while (progress[needed] > leader_score).any():
+                time.sleep(0.0005)
+            if leader_score + 1 < target:
+                guess = values[score, leader_score + 1]
+            elif score + 1 < target:
+                guess = values[score + 1, leader_score]
+            else:
+                guess = 0.5
+            entry = model.entry_values(solo_row, leader_score)
+            _, solo_row[:, leader_score] = _solve_pair(model, values, score, leader_score, entry, guess)
+            progress[score] = leader_score
+    return len(rows)
+
+
+class BestResponseSolver:
+    """Best response in the mixed game to a fixed, score-independent opponent strategy.
+
+    Memoizes our win probability at the start of a round for every pair of
+    (own score, leading opponent score). Rounds are solved exactly over (bank,
+    target, remaining numbers) with the shared spinner: while the opponent is
+    in the round it has our bank and its moves are known; once it banks or
+    busts we play on alone against its new score. Decisions during play are
+    worked out from the memoized table for the current score pair and cached.
+    """
+    def __init__(self, opponent: str = 'ev', target_score: int = 100, spinner_size: int = 13,
+                 ai_first: bool = True, cache_size: int = 8):
+        self.opponent = opponent
+        self.target_score = target_score
+        self.spinner_size = spinner_size
+        self.ai_first = ai_first
+        self.values: Optional[np.ndarray] = None
+        self.cache_size = cache_size
+        self._model: Optional[RoundModel] = None
+        self._solo_cache: 'OrderedDict[int, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        self._contested_cache: 'OrderedDict[Tuple[int, int], np.ndarray]' = OrderedDict()
+
+    @property
+    def model(self) -> RoundModel:
+        if self._model is None:
+            self._model = RoundModel(self.opponent, self.target_score, self.spinner_size, self.ai_first)
+        return self._model
+
+    def solve(self, workers: Optional[int] = None, verbose: bool = True) -> np.ndarray:
+        """Compute the value table, spreading our-score rows over worker processes."""
+        workers = workers or os.cpu_count()
+        target = self.target_score
+        values_memory = shared_memory.SharedMemory(create=True, size=target * target * 8)
+        progress_memory = shared_memory.SharedMemory(create=True, size=target * 8)
+        try:
+            progress = np.ndarray((target,), dtype=np.int64, buffer=progress_memory.buf)
+            progress[:] = target
+            rows = list(range(target - 1, -1, -1))
+            # Round-robin rows so every worker follows the wavefront from the top row down
+            assignments = [rows[worker::workers] for worker in range(workers) if rows[worker::workers]]
+            initargs = (values_memory.name, progress_memory.name, self.opponent, target,
+                        self.spinner_size, self.ai_first)
+            start = time.perf_counter()
+            if len(assignments) == 1:
+                _attach_worker(*initargs)
+                _solve_rows(assignments[0])
+                _worker.clear()
+            else:
+                with ProcessPoolExecutor(max_workers=len(assignments), initializer=_attach_worker,
+                                         initargs=initargs) as pool:
+                    list(pool.map(_solve_rows, assignments))
+            self.values = np.ndarray((target, target), dtype=np.float64, buffer=values_memory.buf).copy()
+        finally:
+            for memory in (values_memory, progress_memory):
+                memory.close()
+                memory.unlink()
+        if verbose:
+            print(f"Solved {target * target} score pairs against '{self.opponent}' with {len(assignments)} "
+                  f"workers in {time.perf_counter() - start:.1f} seconds; "
+                  f"win probability from the start {self.values[0, 0]:.3f}")
+        self._solo_cache.clear()
+        self._contested_cache.clear()
+        return self.values
+
+    def save(self, filename: str):
+        """Write the value table and the settings it was solved for to an .npz file."""
+        with open(filename, 'wb') as f:
+            np.savez(f, values=self.values, opponent=self.opponent, target_score=self.target_score,
+                     spinner_size=self.spinner_size, ai_first=self.ai_first)
+
+    @classmethod
+    def load(cls, filename: str) -> 'BestResponseSolver':
+        with np.load(filename) as saved:
+            solver = cls(str(saved['opponent']), int(saved['target_score']), int(saved['spinner_size']),
+                         bool(saved['ai_first']))
+            solver.values = saved['values']
+        return solver
+
+    def _solo(self, score: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Solo values and decisions for every leader score at our score (LRU cached)."""
+        if score in self._solo_cache:
+            self._solo_cache.move_to_end(score)
+            return self._solo_cache[score]
+        table = self.model.terminal_table(self.values)
+        result = self.model.solo_values(table, score, np.arange(self.target_score))
+        self._solo_cache[score] = result
+        if len(self._solo_cache) > self.cache_size:
+            self._solo_cache.popitem(last=False)
+        return result
+
+    def _contested(self, score: int, leader_score: int) -> np.ndarray:
+        """Decisions while the opponent is in the round, for one score pair (LRU cached)."""
+        key = (score, leader_score)
+        if key in self._contested_cache:
+            self._contested_cache.move_to_end(key)
+            return self._contested_cache[key]
+        model = self.model
+        table = model.terminal_table(self.values)
+        solo_row = self._solo(score)[0]
+        after_bust, after_bank = model.opponent_continuation(table, score, leader_score)
+        after_bust += model.opponent_busts * table[score, leader_score]
+        decisions = model.contested_values(table, score, leader_score, solo_row[:, leader_score],
+                                           model.entry_values(solo_row, leader_score), after_bust, after_bank)[1]
+        self._contested_cache[key] = decisions
+        if len(self._contested_cache) > self.cache_size:
+            self._contested_cache.popitem(last=False)
+        return decisions
+
+    def win_probability(self, score: int = 0, leader_score: int = 0) -> float:
+        """Chance of winning from the start of a round at these scores."""
+        return float(self.values[score, leader_score])
+
+    def get_action(self, score: int, leader_score: int, leader_active: bool, target_num: int, mask: int) -> str:
+        """Best action for a decision with the given scores, opponent status and remaining numbers."""
+        if self.values is None:
+            raise ValueError("Solve or load the value table first")
+        bits = self.spinner_size - 1
+        low_bits = mask & ((1 << (target_num - 1)) - 1)
+        state = ((target_num - 1) << bits) | low_bits | ((mask >> target_num) << (target_num - 1))
+        if leader_active:
+            return ACTIONS[self._contested(score, leader_score)[state]]
+        return ACTIONS[self._solo(score)[1][state, leader_score]]
+
+
+class BestResponsePlayer(Player):
+    """A computer player that best-responds to the most dangerous of several known opponents.
+
+    responses pairs each opponent's Player with a BestResponseSolver solved
+    against that opponent's strategy and our seat relative to it. Each decision
+    follows the solver of the opponent with the lowest heads-up win probability
+    for us, preferring opponents still in the round: they can still bank on
+    this spin, while the others only set a score to beat.
+    """
+    def __init__(self, name: str, responses: List[Tuple[Player, BestResponseSolver]]):
+        super().__init__(name)
+        self.responses = responses
+
+    def get_guess(self, target_num: int, available_numbers: List[int],
+                  index: Optional[RemainingIndex] = None) -> str:
+        candidates = [response for response in self.responses if response[0].is_active] or self.responses
+        opponent, solver = min(candidates, key=lambda response: response[1].win_probability(
+            min(self.score, response[1].target_score - 1), min(response[0].score, response[1].target_score - 1)))
+        mask = index.mask if index is not None else numbers_to_mask(available_numbers)
+        opponent_score = min(opponent.score, solver.target_score - 1)
+        return solver.get_action(self.score, opponent_score, opponent.is_active, target_num, mask)
+
+
+def table_win_rate(solvers: List[BestResponseSolver], games: int = 1000, seed: int = 0,
+                   baseline: Optional[str] = None) -> float:
+    """Win rate of a BestResponsePlayer (or the baseline strategy) at a table of the solvers' opponents.
+
+    The opponents sit in the order given, with us before them all when the
+    solvers were solved from the first seat and after them otherwise.
+    """
+    first = solvers[0]
+    if any((solver.ai_first, solver.target_score, solver.spinner_size) !=
+           (first.ai_first, first.target_score, first.spinner_size) for solver in solvers):
+        raise ValueError("Solvers must share the seat, target score and spinner size")
+    random.seed(seed)
+    wins = 0
+    for _ in range(games):
+        game = MixedPushYourLuckGame(verbose=False)
+        game.main_spinner = list(range(1, first.spinner_size + 1))
+        game.target_score = first.target_score
+        opponents = [make_player(solver.opponent) for solver in solvers]
+        if baseline:
+            player = make_player(baseline)
+        else:
+            player = BestResponsePlayer("Best response", list(zip(opponents, solvers)))
+        for seat in ([player] + opponents if first.ai_first else opponents + [player]):
+            game.add_player(seat)
+        wins += game.play_game() is player
+    return wins / games
+
+
+def head_to_head(solver: BestResponseSolver, games: int = 1000, seed: int = 0,
+                 baseline: Optional[str] = None) -> float:
+    """Win rate of a BestResponsePlayer (or the baseline strategy) against the solver's opponent."""
+    return table_win_rate([solver], games, seed, baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Best response to a fixed opponent strategy in the mixed game")
+    parser.add_argument('--opponent', default='ev', help="opponent strategy spec: safe, probability, ev[:bank:payoff]")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--target-score', type=int, default=100)
+    parser.add_argument('--second', action='store_true', help="solve for sitting after the opponent")
+    parser.add_argument('--output', help="value table file (default: push_your_luck_br_<opponent>.npz)")
+    parser.add_argument('--games', type=int, default=0, help="then play this many games against the opponent")
+    args = parser.parse_args()
+
+    solver = BestResponseSolver(args.opponent, args.target_score, ai_first=not args.second)
+    solver.solve(args.workers)
+    solver.save(args.output or f"push_your_luck_br_{args.opponent.replace(':', '_')}.npz")
+    if args.games:
+        print(f"Best response won {head_to_head(solver, args.games) * 100:.1f}% of {args.games} games; "
+              f"'{args.opponent}' in the same seat won {head_to_head(solver, args.games, baseline=args.opponent) * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
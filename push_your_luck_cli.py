@@ -0,0 +1,299 @@
+import argparse
+import json
+import os
+import pickle
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from push_your_luck_policyio import (
+    EXIT_OK, EXIT_ERROR, EXIT_USAGE, EXIT_GATE_FAILED, LOAD_ERRORS, CLIError, load_solver
+)
+from push_your_luck_solver import PushYourLuckSolver, UPDATE_MODES, UNKNOWN_ACTION
+
+EXPORT_FORMATS = ['npy', 'npz']
+
+
+def save_training_checkpoint(solver: PushYourLuckSolver, filename: str, episodes_done: int):
+    """Write the Q-table together with the exploration schedule and progress."""
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'wb') as f:
+        pickle.dump({'q_table': dict(solver.q_table), 'exploration_rate': solver.exploration_rate,
+                     'episodes_done': episodes_done}, f)
+    os.replace(tmp_filename, filename)
+
+
+def load_training_checkpoint(solver: PushYourLuckSolver, filename: str) -> int:
+    """Restore save_training_checkpoint output into solver; return the episodes already done."""
+    try:
+        with open(filename, 'rb') as f:
+            checkpoint = pickle.load(f)
+        solver.q_table.update(checkpoint['q_table'])
+        solver.exploration_rate = checkpoint['exploration_rate']
+        episodes_done = checkpoint['episodes_done']
+    except LOAD_ERRORS as error:
+        raise CLIError(f"Cannot read checkpoint {filename}: {error!r}")
+    solver._reset_tracking()
+    return episodes_done
+
+
+def train(episodes: int, model_file: str, workers: int = 1, seed: int = 0, checkpoint: Optional[str] = None,
+          checkpoint_every: int = 1000, update_mode: str = 'q') -> Dict[str, Any]:
+    """Train a model and save it; with workers > 1 training is Hogwild across processes.
+
+    A checkpoint is resumed from if it exists. Single-process checkpoints are
+    pickles; Hogwild checkpoints are HogwildTrainer .npz files.
+    """
+    start = time.perf_counter()
+    if workers > 1:
+        if update_mode != 'q':
+            raise CLIError("Multi-worker training only supports update mode 'q'")
+        from push_your_luck_hogwild import HogwildTrainer
+        with HogwildTrainer(workers=workers) as trainer:
+            if checkpoint and os.path.exists(checkpoint):
+                try:
+                    trainer.load_checkpoint(checkpoint)
+                except LOAD_ERRORS as error:
+                    raise CLIError(f"Cannot read multi-worker checkpoint {checkpoint}: {error!r}")
+            resumed_from = trainer.episodes_done
+            trainer.train(episodes, seed=seed, checkpoint_file=checkpoint,
+                          checkpoint_every=checkpoint_every, verbose=False)
+            solver = trainer.to_solver()
+            episodes_done = trainer.episodes_done
+    else:
+        solver = PushYourLuckSolver(update_mode=update_mode)
+        resumed_from = 0
+        if checkpoint and os.path.exists(checkpoint):
+            resumed_from = load_training_checkpoint(solver, checkpoint)
+        # Offset the seed on resume so the continued run does not replay the same spins
+        random.seed(seed + resumed_from)
+        episodes_done = resumed_from
+        while episodes_done < resumed_from + episodes:
+            chunk = min(checkpoint_every if checkpoint else episodes, resumed_from + episodes - episodes_done)
+            solver.train(num_episodes=chunk, verbose=False)
+            episodes_done += chunk
+            if checkpoint:
+                save_training_checkpoint(solver, checkpoint, episodes_done)
+    seconds = time.perf_counter() - start
+
+    solver.prune(verbose=False)
+    solver.save_model(model_file)
+    return {
+        'command': 'train',
+        'model': model_file,
+        'episodes': episodes,
+        'episodes_done': episodes_done,
+        'resumed_from': resumed_from,
+        'workers': workers,
+        'update_mode': update_mode,
+        'seconds': seconds,
+        'episodes_per_sec': episodes / seconds if seconds else None,
+        'q_table_size': len(solver.q_table),
+        'exploration_rate': solver.exploration_rate,
+    }
+
+
+def evaluate(model_file: str, games: int = 1000, seed: int = 0, max_rounds: int = 200) -> Dict[str, Any]:
+    """Play silent greedy games with a saved model and summarise rounds to win."""
+    solver = load_solver(model_file)
+    solver.exploration_rate = 0
+    random.seed(seed)
+    rounds: List[int] = []
+    wins = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        score, rounds_played = solver.play_game(verbose=False, max_rounds=max_rounds)
+        rounds.append(rounds_played)
+        if score >= solver.target_score:
+            wins += 1
+    seconds = time.perf_counter() - start
+
+    rounds.sort()
+    return {
+        'command': 'eval',
+        'model': model_file,
+        'games': games,
+        'seed': seed,
+        'wins': wins,
+        'win_rate': wins / games,
+        'avg_rounds': sum(rounds) / games,
+        'median_rounds': rounds[games // 2],
+        'p90_rounds': rounds[min(games - 1, int(games * 0.9))],
+        'seconds': seconds,
+        'games_per_sec': games / seconds if seconds else None,
+    }
+
+
+def export(model_file: str, fmt: str = 'npy', output: Optional[str] = None) -> Dict[str, Any]:
+    """Write the greedy policy as a packed state_index array (see PushYourLuckSolver.compile_policy).
+
+    npy is memory-mappable and what the policy service loads fastest; npz is
+    the same array compressed.
+    """
+    import numpy as np
+
+    solver = load_solver(model_file)
+    policy = solver.compile_policy()
+    output = output or f"{os.path.splitext(model_file)[0]}_policy.{fmt}"
+    if fmt == 'npy':
+        with open(output, 'wb') as f:
+            np.save(f, policy)
+    elif fmt == 'npz':
+        with open(output, 'wb') as f:
+            np.savez_compressed(f, policy=policy)
+    else:
+        raise CLIError(f"Unknown export format: {fmt}")
+    return {
+        'command': 'export',
+        'model': model_file,
+        'format': fmt,
+        'output': output,
+        'bytes': os.path.getsize(output),
+        'states': len(policy),
+        'known_states': int((policy != UNKNOWN_ACTION).sum()),
+    }
+
+
+def _simulate_game(seats: Tuple[str, ...], seed: int, max_rounds: int) -> Tuple[Optional[int], List[int]]:
+    """Play one headless mixed game; return the winning seat index and final scores."""
+    from push_your_luck_mixed import MixedPushYourLuckGame
+    from push_your_luck_tournament import make_player
+
+    random.seed(seed)
+    game = MixedPushYourLuckGame(verbose=False)
+    for spec in seats:
+        game.add_player(make_player(spec))
+    winner = game.play_game(max_rounds=max_rounds)
+    winner_seat = next(i for i, player in enumerate(game.players) if player is winner) if winner else None
+    return winner_seat, [player.score for player in game.players]
+
+
+def simulate(seats: List[str], games: int = 100, seed: int = 0, max_rounds: int = 500,
+             workers: int = 1) -> Dict[str, Any]:
+    """Play headless mixed games between computer strategies and report results per seat."""
+    from push_your_luck_tournament import make_player
+
+    if len(seats) < 1:
+        raise CLIError("simulate needs at least one player")
+    for spec in seats:
+        kind, _, model_file = spec.partition(':')
+        if kind == 'ai' and not os.path.exists(model_file or "push_your_luck_model.pkl"):
+            raise CLIError(f"Model file not found: {model_file or 'push_your_luck_model.pkl'}")
+        try:
+            make_player(spec)
+        except ValueError as error:
+            raise CLIError(str(error))
+
+    rng = random.Random(seed)
+    game_seeds = [rng.randrange(2 ** 32) for _ in range(games)]
+    start = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_game, [tuple(seats)] * games, game_seeds, [max_rounds] * games,
+                                    chunksize=max(1, games // (workers * 4))))
+    else:
+        results = [_simulate_game(tuple(seats), game_seed, max_rounds) for game_seed in game_seeds]
+    seconds = time.perf_counter() - start
+
+    wins = [0] * len(seats)
+    total_scores = [0] * len(seats)
+    unfinished = 0
+    for winner_seat, scores in results:
+        if winner_seat is None:
+            unfinished += 1
+        else:
+            wins[winner_seat] += 1
+        for seat, score in enumerate(scores):
+            total_scores[seat] += score
+    return {
+        'command': 'simulate',
+        'games': games,
+        'seed': seed,
+        'unfinished': unfinished,
+        'seconds': seconds,
+        'seats': [{'strategy': spec, 'wins': wins[seat], 'win_rate': wins[seat] / games,
+                   'avg_score': total_scores[seat] / games} for seat, spec in enumerate(seats)],
+    }
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Non-interactive Push Your Luck batch commands. Results are printed as one JSON "
+                    f"object; exit codes: {EXIT_OK} ok, {EXIT_ERROR} error, {EXIT_USAGE} bad arguments, "
+                    f"{EXIT_GATE_FAILED} eval gate failed.")
+    parser.add_argument('--output', help="write the JSON result to this file instead of stdout")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help="train and save a model")
+    train_parser.add_argument('--episodes', type=positive_int, default=10000)
+    train_parser.add_argument('--workers', type=positive_int, default=1, help="more than 1 trains Hogwild-style")
+    train_parser.add_argument('--seed', type=int, default=0)
+    train_parser.add_argument('--model', default="push_your_luck_model.pkl", help="model file to write")
+    train_parser.add_argument('--checkpoint', help="checkpoint file, resumed from if it exists")
+    train_parser.add_argument('--checkpoint-every', type=positive_int, default=1000, help="episodes between checkpoints")
+    train_parser.add_argument('--update-mode', choices=UPDATE_MODES, default='q')
+
+    eval_parser = subparsers.add_parser('eval', help="play silent greedy games with a model")
+    eval_parser.add_argument('--model', default="push_your_luck_model.pkl")
+    eval_parser.add_argument('--games', type=positive_int, default=1000)
+    eval_parser.add_argument('--seed', type=int, default=0)
+    eval_parser.add_argument('--max-rounds', type=positive_int, default=200, help="abandon a game after this many rounds")
+    eval_parser.add_argument('--max-avg-rounds', type=float, help="fail (exit 3) above this average")
+    eval_parser.add_argument('--min-win-rate', type=float, help="fail (exit 3) below this win rate")
+
+    export_parser = subparsers.add_parser('export', help="export the greedy policy as a packed array")
+    export_parser.add_argument('--model', default="push_your_luck_model.pkl")
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS, default='npy')
+    export_parser.add_argument('--policy-file', help="output file (default: <model>_policy.<format>)")
+
+    simulate_parser = subparsers.add_parser('simulate', help="headless mixed games between computer strategies")
+    simulate_parser.add_argument('players', nargs='+',
+                                 help="one spec per seat: safe, probability, ev[:bank:payoff], ai[:model.pkl]")
+    simulate_parser.add_argument('--games', type=positive_int, default=100)
+    simulate_parser.add_argument('--seed', type=int, default=0)
+    simulate_parser.add_argument('--max-rounds', type=positive_int, default=500)
+    simulate_parser.add_argument('--workers', type=positive_int, default=1)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    exit_code = EXIT_OK
+    try:
+        if args.command == 'train':
+            result = train(args.episodes, args.model, args.workers, args.seed, args.checkpoint,
+                           args.checkpoint_every, args.update_mode)
+        elif args.command == 'eval':
+            result = evaluate(args.model, args.games, args.seed, args.max_rounds)
+            passed = (args.max_avg_rounds is None or result['avg_rounds'] <= args.max_avg_rounds) and \
+                     (args.min_win_rate is None or result['win_rate'] >= args.min_win_rate)
+            result['passed'] = passed
+            if not passed:
+                exit_code = EXIT_GATE_FAILED
+        elif args.command == 'export':
+            result = export(args.model, args.format, args.policy_file)
+        else:
+            result = simulate(args.players, args.games, args.seed, args.max_rounds, args.workers)
+    except (CLIError, OSError) as error:
+        print(json.dumps({'command': args.command, 'error': str(error)}), file=sys.stderr)
+        return EXIT_ERROR
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result))
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from push_your_luck_solver import PushYourLuckSolver, UPDATE_MODES
+
+# Evaluation games use their own seed so every checkpoint and mode sees the same spins
+EVAL_SEED = 12345
+
+
+def evaluate(solver: PushYourLuckSolver, games: int = 200, max_rounds: int = 200) -> float:
+    """Average rounds to win over greedy games, without disturbing training's random state."""
+    exploration_rate = solver.exploration_rate
+    training_state = random.getstate()
+    solver.exploration_rate = 0
+    random.seed(EVAL_SEED)
+    total_rounds = 0
+    for _ in range(games):
+        _, rounds = solver.play_game(verbose=False, max_rounds=max_rounds)
+        total_rounds += rounds
+    random.setstate(training_state)
+    solver.exploration_rate = exploration_rate
+    return total_rounds / games
+
+
+def time_to_target(update_mode: str, target_rounds: float, check_every: int = 500, max_episodes: int = 20000,
+                   eval_games: int = 200, seed: int = 0, n_steps: int = 3) -> Dict[str, Any]:
+    """Train with update_mode until the greedy policy wins in target_rounds on average.
+
+    Returns the episodes and training wall-clock needed (evaluation time is not
+    counted), or reached=False with the budget spent if the target was missed.
+    """
+    random.seed(seed)
+    solver = PushYourLuckSolver(update_mode=update_mode, n_steps=n_steps)
+    episodes = 0
+    training_seconds = 0.0
+    avg_rounds = float('inf')
+    while episodes < max_episodes:
+        start = time.perf_counter()
+        solver.train(num_episodes=check_every, verbose=False)
+        training_seconds += time.perf_counter() - start
+        episodes += check_every
+        avg_rounds = evaluate(solver, eval_games)
+        if avg_rounds <= target_rounds:
+            break
+    return {
+        'mode': update_mode if update_mode != 'nstep' else f"nstep({n_steps})",
+        'seed': seed,
+        'reached': avg_rounds <= target_rounds,
+        'episodes': episodes,
+        'seconds': training_seconds,
+        'avg_rounds': avg_rounds,
+    }
+
+
+def benchmark_update_modes(target_rounds: float = 15.5, modes: Optional[List[str]] = None,
+                           seeds: Optional[List[int]] = None, **kwargs) -> List[Dict[str, Any]]:
+    """Run time_to_target for each update mode and seed."""
+    modes = modes or list(UPDATE_MODES)
+    seeds = seeds if seeds is not None else [0]
+    return [time_to_target(mode, target_rounds, seed=seed, **kwargs) for mode in modes for seed in seeds]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Episodes and wall-clock each solver update mode needs to reach a target")
+    parser.add_argument('--target-rounds', type=float, default=15.5, help="average greedy rounds to win to reach")
+    parser.add_argument('--modes', nargs='+', choices=UPDATE_MODES, default=list(UPDATE_MODES))
+    parser.add_argument('--n-steps', type=int, default=3, help="lookahead for the nstep mode")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    parser.add_argument('--check-every', type=int, default=500, help="training episodes between evaluations")
+    parser.add_argument('--max-episodes', type=int, default=20000)
+    parser.add_argument('--eval-games', type=int, default=200)
+    args = parser.parse_args()
+
+    results = benchmark_update_modes(args.target_rounds, args.modes, args.seeds, check_every=args.check_every,
+                                     max_episodes=args.max_episodes, eval_games=args.eval_games,
+                                     n_steps=args.n_steps)
+    for result in results:
+        status = "reached" if result['reached'] else "missed "
+        print(f"{result['mode']:>9} seed={result['seed']}: {status} {args.target_rounds} rounds "
+              f"after {result['episodes']} episodes, {result['seconds']:.2f}s training "
+              f"(avg rounds {result['avg_rounds']:.2f})")
+
+if __name__ == "__main__":
+    main()
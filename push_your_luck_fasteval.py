@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from push_your_luck_policyio import EXIT_OK, EXIT_ERROR, LOAD_ERRORS, CLIError, load_solver, load_policy
+from push_your_luck_solver import PushYourLuckSolver, BANK, LOWER, UNKNOWN_ACTION, compress_mask, num_states
+
+
+class FastEvaluator:
+    """Plays greedy games of a packed policy many at a time, in lockstep.
+
+    Each slot of a fixed-size batch holds one game in progress as NumPy arrays
+    of score, bank, target and remaining mask, and every step takes one
+    decision in every slot. Buffers are allocated once and updated in place;
+    each step draws the spins for the whole batch at once, and policy lookups
+    are integer state_index arithmetic through precomputed tables. A slot whose
+    game ends starts the next one, so the batch stays full until the last games.
+    """
+    def __init__(self, policy: np.ndarray, target_score: int = 100, spinner_size: int = 13,
+                 batch_size: int = 65536):
+        size = num_states(target_score, spinner_size)
+        if len(policy) < size:
+            raise ValueError(f"Policy has {len(policy)} states, expected {size}")
+        self.policy = np.ascontiguousarray(policy[:size], dtype=np.int8)
+        self.target_score = target_score
+        self.spinner_size = spinner_size
+        self.batch_size = batch_size
+        self.block = spinner_size << (spinner_size - 1)  # States per score
+
+        masks = np.arange(1 << spinner_size, dtype=np.int64)
+        # offsets[target << spinner_size | mask]: the state's position within its score's block
+        self.offsets = np.zeros((spinner_size + 1) << spinner_size, dtype=np.int64)
+        for target_num in range(1, spinner_size + 1):
+            self.offsets[(target_num << spinner_size) + masks] = \
+                ((target_num - 1) << (spinner_size - 1)) | compress_mask(masks, target_num)
+        # counts[mask]: numbers remaining; smallest[mask * spinner_size + k]: k-th smallest of them
+        bits = (masks[:, None] >> np.arange(spinner_size)) & 1
+        self.counts = bits.sum(axis=1)
+        smallest = np.zeros((1 << spinner_size, spinner_size), dtype=np.int64)
+        rows, columns = np.nonzero(bits)
+        smallest[rows, (np.cumsum(bits, axis=1) - 1)[rows, columns]] = columns + 1
+        self.smallest = smallest.ravel()
+
+    def run(self, games: int, seed: int = 0, max_rounds: int = 200) -> Dict[str, Any]:
+        """Play games greedy games and return histograms of rounds to win and of round outcomes.
+
+        Games follow play_game's rules and are abandoned after max_rounds, but
+        use NumPy's generator, so they match play_game in distribution only.
+        """
+        rng = np.random.default_rng(seed)
+        spinner_size = self.spinner_size
+        slots = min(self.batch_size, games)
+
+        # Games in progress; uncounted slots keep playing once every game has been handed out
+        score = np.zeros(slots, dtype=np.int64)
+        rounds = np.zeros(slots, dtype=np.int64)
+        bank = np.zeros(slots, dtype=np.int64)
+        target = np.zeros(slots, dtype=np.int64)
+        mask = np.zeros(slots, dtype=np.int64)
+        counted = np.ones(slots, dtype=bool)
+        # Scratch buffers reused every step
+        uniforms = np.empty((3, slots))  # Next number, random action for unknown states, next round's target
+        scaled = np.empty(slots)
+        index = np.empty(slots, dtype=np.int64)
+        scratch = np.empty(slots, dtype=np.int64)
+        count = np.empty(slots, dtype=np.int64)
+        next_num = np.empty(slots, dtype=np.int64)
+        action = np.empty(slots, dtype=np.int8)
+        banking = np.empty(slots, dtype=bool)
+        correct = np.empty(slots, dtype=bool)
+        flag = np.empty(slots, dtype=bool)
+
+        rounds_histogram = np.zeros(max_rounds + 1, dtype=np.int64)
+        bank_histogram = np.zeros(spinner_size * (spinner_size + 1) // 2 + 1, dtype=np.int64)
+        started, won, abandoned, abandoned_rounds = slots, 0, 0, 0
+        start = time.perf_counter()
+
+        ended = np.arange(slots)
+        while True:
+            # Start a round in every slot whose last one ended
+            rng.random(out=uniforms)
+            new_target = (uniforms[2, ended] * spinner_size).astype(np.int64) + 1
+            target[ended] = new_target
+            bank[ended] = new_target
+            mask[ended] = ((1 << spinner_size) - 1) ^ (1 << (new_target - 1))
+
+            # state_index = score * block + offsets[target << spinner_size | mask]
+            np.left_shift(target, spinner_size, out=index)
+            np.bitwise_or(index, mask, out=index)
+            np.take(self.offsets, index, out=index)
+            np.multiply(score, self.block, out=scratch)
+            np.add(index, scratch, out=index)
+            np.take(self.policy, index, out=action)
+            np.equal(action, UNKNOWN_ACTION, out=flag)
+            if flag.any():
+                # Unknown states act uniformly at random, like get_action
+                action[flag] = (uniforms[1, flag] * 3).astype(np.int8)
+
+            # Bank by choice, or automatically with fewer than two numbers left
+            np.take(self.counts, mask, out=count)
+            np.equal(action, BANK, out=banking)
+            np.less(count, 2, out=flag)
+            np.logical_or(banking, flag, out=banking)
+
+            # Spin: the k-th smallest remaining number, for k uniform below count
+            np.multiply(uniforms[0], count, out=scaled)
+            np.copyto(scratch, scaled, casting='unsafe')
+            np.multiply(mask, spinner_size, out=index)
+            np.add(index, scratch, out=index)
+            np.take(self.smallest, index, out=next_num)
+            # A guess is right when "next is higher" differs from "guessed lower"
+            np.greater(next_num, target, out=correct)
+            np.equal(action, LOWER, out=flag)
+            np.logical_xor(correct, flag, out=correct)
+
+            # Correct guesses carry on with the drawn number as the target
+            np.logical_not(banking, out=flag)
+            np.logical_and(flag, correct, out=flag)
+            np.add(bank, next_num, out=bank, where=flag)
+            np.subtract(next_num, 1, out=scratch)
+            np.left_shift(1, scratch, out=scratch)
+            np.bitwise_xor(mask, scratch, out=mask, where=flag)
+            np.copyto(target, next_num, where=flag)
+
+            # Every other round ended, by banking or busting
+            np.logical_not(flag, out=flag)
+            ended = np.flatnonzero(flag)
+            banked = bank[ended] * banking[ended]
+            bank_histogram += np.bincount(banked[counted[ended]], minlength=len(bank_histogram))
+            score[ended] += banked
+            rounds[ended] += 1
+
+            finished = ended[(score[ended] >= self.target_score) | (rounds[ended] >= max_rounds)]
+            if len(finished):
+                results = finished[counted[finished]]
+                wins = results[score[results] >= self.target_score]
+                rounds_histogram += np.bincount(rounds[wins], minlength=len(rounds_histogram))
+                won += len(wins)
+                abandoned += len(results) - len(wins)
+                abandoned_rounds += int(rounds[results].sum() - rounds[wins].sum())
+                if won + abandoned == games:
+                    break
+                # Hand out the remaining games; slots without one play on uncounted
+                restart = min(len(results), games - started)
+                counted[results[restart:]] = False
+                started += restart
+                score[finished] = 0
+                rounds[finished] = 0
+
+        seconds = time.perf_counter() - start
+        rounds_total = int((rounds_histogram * np.arange(len(rounds_histogram))).sum()) + abandoned_rounds
+        return {
+            'games': games,
+            'seed': seed,
+            'won': won,
+            'abandoned': abandoned,
+            'avg_rounds': rounds_total / games,  # Abandoned games count their max_rounds, as in play_game
+            'rounds_histogram': rounds_histogram,  # Won games by rounds played
+            'bank_histogram': bank_histogram,  # Rounds by points banked (0 for a bust)
+            'seconds': seconds,
+            'games_per_second': games / seconds,
+        }
+
+
+def play_game_throughput(solver: PushYourLuckSolver, games: int, seed: int = 0,
+                         max_rounds: int = 200) -> Dict[str, Any]:
+    """Time greedy games through the existing play_game, for comparison with FastEvaluator."""
+    exploration_rate = solver.exploration_rate
+    solver.exploration_rate = 0
+    random.seed(seed)
+    total_rounds = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        _, rounds_played = solver.play_game(verbose=False, max_rounds=max_rounds)
+        total_rounds += rounds_played
+    seconds = time.perf_counter() - start
+    solver.exploration_rate = exploration_rate
+    return {
+        'games': games,
+        'avg_rounds': total_rounds / games,
+        'seconds': seconds,
+        'games_per_second': games / seconds,
+    }
+
+
+def compare(solver: PushYourLuckSolver, games: int = 1000000, baseline_games: int = 2000, seed: int = 0,
+            max_rounds: int = 200, batch_size: int = 65536) -> Dict[str, Any]:
+    """Evaluate solver's greedy policy both ways and report their throughput side by side."""
+    evaluator = FastEvaluator(solver.compile_policy(), solver.target_score, len(solver.main_spinner), batch_size)
+    fast = evaluator.run(games, seed, max_rounds)
+    baseline = play_game_throughput(solver, baseline_games, seed, max_rounds)
+    fast['play_game'] = baseline
+    fast['speedup'] = fast['games_per_second'] / baseline['games_per_second']
+    return fast
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate a Push Your Luck model over many greedy games at once")
+    parser.add_argument('model', help="pickled model, or .npy/.npz policy export")
+    parser.add_argument('--games', type=int, default=1000000)
+    parser.add_argument('--baseline-games', type=int, default=2000,
+                        help="games to time through play_game for comparison (pickled models only; 0 to skip)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-rounds', type=int, default=200, help="abandon games after this many rounds")
+    parser.add_argument('--batch-size', type=int, default=65536, help="games played at once")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    try:
+        if not os.path.exists(args.model):
+            raise CLIError(f"Model file not found: {args.model}")
+        if args.model.endswith(('.npy', '.npz')):
+            report = FastEvaluator(load_policy(args.model), batch_size=args.batch_size).run(
+                args.games, args.seed, args.max_rounds)
+        elif not args.baseline_games:
+            report = FastEvaluator(load_solver(args.model).compile_policy(), batch_size=args.batch_size).run(
+                args.games, args.seed, args.max_rounds)
+        else:
+            report = compare(load_solver(args.model), args.games, args.baseline_games, args.seed,
+                             args.max_rounds, args.batch_size)
+    except (CLIError, OSError) + LOAD_ERRORS as error:
+        print(json.dumps({'error': str(error)}), file=sys.stderr)
+        return EXIT_ERROR
+    report['model'] = args.model
+    report['rounds_histogram'] = report['rounds_histogram'].tolist()
+    report['bank_histogram'] = report['bank_histogram'].tolist()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report))
+    return EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
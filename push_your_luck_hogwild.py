@@ -0,0 +1,290 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from push_your_luck_solver import (
+    PushYourLuckSolver, ACTIONS, HIGHER, LOWER, BANK, state_index, unpack_state_index, num_states
+)
+
+
+# Set in each worker process by _attach_worker
+_worker: Dict[str, object] = {}
+
+
+def _attach_worker(q_name: str, visited_name: str, params: Dict[str, float]):
+    """Map the shared Q-value and visited arrays into a worker process."""
+    q_memory = shared_memory.SharedMemory(name=q_name)
+    visited_memory = shared_memory.SharedMemory(name=visited_name)
+    _worker.update(params)
+    _worker['memory'] = (q_memory, visited_memory)  # Keep the mappings alive
+    _worker['q'] = q_memory.buf.cast('d')
+    _worker['visited'] = visited_memory.buf.cast('B')
+
+
+def _run_episodes(first_episode: int, count: int, seed: int) -> Tuple[int, int, int]:
+    """Play count training episodes, updating the shared Q-values without locks.
+
+    Mirrors PushYourLuckSolver.train, with states packed by state_index. Returns
+    (episodes, wins, rounds played).
+    """
+    q = _worker['q']
+    visited = _worker['visited']
+    learning_rate = _worker['learning_rate']
+    discount_factor = _worker['discount_factor']
+    exploration_rate = _worker['exploration_rate']
+    min_exploration_rate = _worker['min_exploration_rate']
+    exploration_decay = _worker['exploration_decay']
+    target_score = _worker['target_score']
+    spinner_size = _worker['spinner_size']
+    main_spinner = list(range(1, spinner_size + 1))
+    rng = random.Random(seed)
+
+    def best_value(index: int) -> float:
+        # Max over the actions that have been updated, like max(q_table[next_state].values())
+        flags = visited[index]
+        if not flags:
+            return 0.0
+        base = index * 3
+        return max(q[base + action] for action in range(3) if flags >> action & 1)
+
+    def update(index: int, action: int, reward: float, next_index: Optional[int]):
+        next_max_q = best_value(next_index) if next_index is not None else 0.0
+        slot = index * 3 + action
+        current_q = q[slot]
+        q[slot] = current_q + learning_rate * (reward + discount_factor * next_max_q - current_q)
+        visited[index] |= 1 << action
+
+    wins = 0
+    total_rounds = 0
+    for episode in range(first_episode, first_episode + count):
+        # The coordinator's decay schedule, evaluated for this episode
+        epsilon = max(min_exploration_rate, exploration_rate * exploration_decay ** episode)
+        score = 0
+        while True:
+            round_spinner = main_spinner.copy()
+            target_num = rng.choice(round_spinner)
+            round_spinner.remove(target_num)
+            mask = ((1 << spinner_size) - 1) ^ (1 << (target_num - 1))
+            bank = target_num
+            total_rounds += 1
+
+            while True:
+                index = state_index(score, target_num, mask, spinner_size)
+                flags = visited[index]
+                if rng.random() < epsilon or not flags:
+                    action = rng.randrange(3)
+                else:
+                    base = index * 3
+                    action = max((a for a in range(3) if flags >> a & 1), key=lambda a: q[base + a])
+
+                if action == BANK or len(round_spinner) < 2:
+                    action = BANK  # Banking automatically is learned as a bank, win reward included
+                    score += bank
+                    update(index, action, -1, None)
+                    break
+
+                next_num = rng.choice(round_spinner)
+                round_spinner.remove(next_num)
+                mask ^= 1 << (next_num - 1)
+
+                if (action == HIGHER and next_num > target_num) or \
+                   (action == LOWER and next_num < target_num):
+                    bank += next_num
+                    target_num = next_num
+                    update(index, action, 3 - 1, state_index(score, target_num, mask, spinner_size))
+                else:
+                    update(index, action, -2 - 1, None)
+                    break
+
+            if score >= target_score:
+                wins += 1
+                update(index, action, 100, None)
+                break
+
+    return count, wins, total_rounds
+
+
+class HogwildTrainer:
+    """Trains one shared Q-value array from several worker processes, Hogwild-style.
+
+    Q-values live in multiprocessing.shared_memory as a flat float64 array with
+    three actions per packed state. Workers read and write it without locks; the
+    coordinator hands out episode ranges, owns the exploration decay schedule,
+    and takes care of checkpoints and progress reporting.
+    """
+    def __init__(self, workers: Optional[int] = None, learning_rate=0.1, discount_factor=0.95, exploration_rate=1.0,
+                 min_exploration_rate=0.01, exploration_decay=0.995, target_score: int = 100, spinner_size: int = 13):
+        self.workers = workers or os.cpu_count()
+        self.params = {
+            'learning_rate': learning_rate,
+            'discount_factor': discount_factor,
+            'exploration_rate': exploration_rate,
+            'min_exploration_rate': min_exploration_rate,
+            'exploration_decay': exploration_decay,
+            'target_score': target_score,
+            'spinner_size': spinner_size,
+        }
+        self.states = num_states(target_score, spinner_size)
+        self.q_memory = shared_memory.SharedMemory(create=True, size=self.states * 3 * 8)
+        self.visited_memory = shared_memory.SharedMemory(create=True, size=self.states)
+        self.episodes_done = 0
+
+    @property
+    def exploration_rate(self) -> float:
+        """Current exploration rate under the decay schedule."""
+        return max(self.params['min_exploration_rate'],
+                   self.params['exploration_rate'] * self.params['exploration_decay'] ** self.episodes_done)
+
+    def arrays(self):
+        """NumPy views of the shared Q-values (states x 3) and visited flags."""
+        import numpy as np
+        q = np.ndarray((self.states, 3), dtype=np.float64, buffer=self.q_memory.buf)
+        visited = np.ndarray((self.states,), dtype=np.uint8, buffer=self.visited_memory.buf)
+        return q, visited
+
+    def train(self, num_episodes: int, chunk_size: int = 250, seed: int = 0,
+              checkpoint_file: Optional[str] = None, checkpoint_every: int = 0,
+              verbose: bool = True) -> Dict[str, float]:
+        """Train for num_episodes across the worker pool and return progress metrics."""
+        rng = random.Random(seed)
+        chunks = []
+        first = self.episodes_done
+        while first < self.episodes_done + num_episodes:
+            count = min(chunk_size, self.episodes_done + num_episodes - first)
+            chunks.append((first, count, rng.randrange(2 ** 32)))
+            first += count
+
+        wins = 0
+        total_rounds = 0
+        last_checkpoint = self.episodes_done
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_attach_worker,
+                                 initargs=(self.q_memory.name, self.visited_memory.name, self.params)) as pool:
+            for done, (episodes, chunk_wins, rounds) in enumerate(pool.map(_run_episodes, *zip(*chunks)), start=1):
+                self.episodes_done += episodes
+                wins += chunk_wins
+                total_rounds += rounds
+                if checkpoint_file and checkpoint_every and self.episodes_done - last_checkpoint >= checkpoint_every:
+                    self.save_checkpoint(checkpoint_file)
+                    last_checkpoint = self.episodes_done
+                if verbose and (done % 10 == 0 or done == len(chunks)):
+                    elapsed = time.perf_counter() - start
+                    played = self.episodes_done - chunks[0][0]
+                    print(f"Episode {self.episodes_done}: {played / elapsed:.0f} episodes/sec, "
+                          f"average rounds per game {total_rounds / played:.2f}, "
+                          f"exploration rate {self.exploration_rate:.3f}")
+        elapsed = time.perf_counter() - start
+
+        if checkpoint_file:
+            self.save_checkpoint(checkpoint_file)
+        return {
+            'episodes': num_episodes,
+            'seconds': elapsed,
+            'episodes_per_sec': num_episodes / elapsed,
+            'win_rate': wins / num_episodes,
+            'avg_rounds': total_rounds / num_episodes,
+        }
+
+    def save_checkpoint(self, filename: str):
+        """Write the Q-values, visited flags and progress to an .npz file."""
+        import numpy as np
+        q, visited = self.arrays()
+        tmp_filename = filename + '.tmp.npz'
+        np.savez(tmp_filename, q=q, visited=visited, episodes_done=self.episodes_done)
+        os.replace(tmp_filename, filename)
+
+    def load_checkpoint(self, filename: str):
+        """Restore Q-values, visited flags and progress from save_checkpoint output."""
+        import numpy as np
+        q, visited = self.arrays()
+        with np.load(filename) as checkpoint:
+            q[:] = checkpoint['q']
+            visited[:] = checkpoint['visited']
+            self.episodes_done = int(checkpoint['episodes_done'])
+
+    def to_solver(self) -> PushYourLuckSolver:
+        """Copy the shared Q-values into a PushYourLuckSolver, e.g. to save_model or play_game."""
+        import numpy as np
+        solver = PushYourLuckSolver(**{name: self.params[name] for name in
+                                       ('learning_rate', 'discount_factor', 'min_exploration_rate', 'exploration_decay')})
+        solver.exploration_rate = self.exploration_rate
+        solver.target_score = self.params['target_score']
+        spinner_size = self.params['spinner_size']
+        solver.main_spinner = list(range(1, spinner_size + 1))
+        total = spinner_size * (spinner_size + 1) // 2
+
+        q, visited = self.arrays()
+        for index in np.flatnonzero(visited).tolist():
+            score, target_num, mask = unpack_state_index(index, spinner_size)
+            numbers = [num for num in range(1, spinner_size + 1) if mask >> (num - 1) & 1]
+            state = solver.get_state_key(score, total - sum(numbers), target_num, numbers)
+            for action in range(3):
+                if visited[index] >> action & 1:
+                    solver.q_table[state][ACTIONS[action]] = float(q[index, action])
+        return solver
+
+    def close(self):
+        """Release the shared memory."""
+        for memory in (self.q_memory, self.visited_memory):
+            memory.close()
+            memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def benchmark_scaling(num_episodes: int = 5000, max_workers: Optional[int] = None, seed: int = 0) -> List[Dict[str, float]]:
+    """Compare episodes/sec of PushYourLuckSolver.train with Hogwild training on 1..N workers."""
+    max_workers = max_workers or os.cpu_count()
+    random.seed(seed)
+    solver = PushYourLuckSolver()
+    start = time.perf_counter()
+    solver.train(num_episodes=num_episodes, verbose=False)
+    baseline = num_episodes / (time.perf_counter() - start)
+    results = [{'mode': 'PushYourLuckSolver.train', 'workers': 1, 'episodes_per_sec': baseline, 'speedup': 1.0}]
+
+    for workers in range(1, max_workers + 1):
+        with HogwildTrainer(workers=workers) as trainer:
+            stats = trainer.train(num_episodes, seed=seed, verbose=False)
+        results.append({'mode': 'hogwild', 'workers': workers, 'episodes_per_sec': stats['episodes_per_sec'],
+                        'speedup': stats['episodes_per_sec'] / baseline})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-memory (Hogwild) training for the Push Your Luck solver")
+    parser.add_argument('--episodes', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoint', help="checkpoint .npz file, resumed from if it exists")
+    parser.add_argument('--checkpoint-every', type=int, default=5000, help="episodes between checkpoints")
+    parser.add_argument('--save-model', help="also write a pickled model usable by AIPlayer")
+    parser.add_argument('--benchmark', action='store_true', help="report episodes/sec scaling from 1 to N workers")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for row in benchmark_scaling(args.episodes, args.workers, args.seed):
+            print(f"{row['mode']:>24} workers={row['workers']}: "
+                  f"{row['episodes_per_sec']:.0f} episodes/sec ({row['speedup']:.2f}x)")
+        return
+
+    with HogwildTrainer(workers=args.workers) as trainer:
+        if args.checkpoint and os.path.exists(args.checkpoint):
+            trainer.load_checkpoint(args.checkpoint)
+            print(f"Resumed from episode {trainer.episodes_done}")
+        stats = trainer.train(args.episodes, seed=args.seed, checkpoint_file=args.checkpoint,
+                              checkpoint_every=args.checkpoint_every)
+        print(f"\nTrained {stats['episodes']} episodes in {stats['seconds']:.2f} seconds "
+              f"({stats['episodes_per_sec']:.0f} episodes/sec)")
+        if args.save_model:
+            trainer.to_solver().save_model(args.save_model)
+
+if __name__ == "__main__":
+    main()
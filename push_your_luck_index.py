@@ -0,0 +1,144 @@
+from typing import Dict, Iterable, List, Tuple
+
+
+def numbers_to_mask(numbers: Iterable[int]) -> int:
+    """Pack remaining spinner numbers into a bitmask (bit n-1 set for number n)."""
+    mask = 0
+    for num in numbers:
+        mask |= 1 << (num - 1)
+    return mask
+
+
+def mask_to_numbers(mask: int) -> List[int]:
+    """Unpack a remaining-number bitmask into a sorted list."""
+    numbers = []
+    num = 1
+    while mask:
+        if mask & 1:
+            numbers.append(num)
+        mask >>= 1
+        num += 1
+    return numbers
+
+
+# Full-spinner indexes by size, copied at the start of each round
+_full_spinners: Dict[int, 'RemainingIndex'] = {}
+
+
+class RemainingIndex:
+    """Counts and sums of the numbers left on the spinner, kept in Fenwick trees.
+
+    Removing a drawn number is O(log n), and so are the count, sum and mean of
+    the numbers above or below any target, so bots and the solver do not rescan
+    the spinner on every decision. Duplicates are counted, although the game
+    spinners never contain any.
+    """
+    def __init__(self, numbers: Iterable[int] = (), size: int = 13):
+        self.size = size
+        self.count_tree = [0] * (size + 1)
+        self.sum_tree = [0] * (size + 1)
+        self.multiplicity = [0] * (size + 1)
+        self.total_count = 0
+        self.total_sum = 0
+        self.mask = 0  # Bit n-1 set while number n remains
+        # Prefix (count, sum) per query point, valid until the next add or remove;
+        # every player at the table asks about the same target between draws
+        self._prefix_cache: Dict[int, Tuple[int, int]] = {}
+        for num in numbers:
+            self.count_tree[num] += 1
+            self.sum_tree[num] += num
+            self.multiplicity[num] += 1
+            self.total_count += 1
+            self.total_sum += num
+            self.mask |= 1 << (num - 1)
+        # Linear-time build: push each node's total into its Fenwick parent once
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                self.count_tree[parent] += self.count_tree[i]
+                self.sum_tree[parent] += self.sum_tree[i]
+
+    @classmethod
+    def full_spinner(cls, size: int = 13) -> 'RemainingIndex':
+        """A fresh index holding 1..size, copied from a cached template."""
+        template = _full_spinners.get(size)
+        if template is None:
+            template = _full_spinners[size] = cls(range(1, size + 1), size)
+        return template.copy()
+
+    def copy(self) -> 'RemainingIndex':
+        index = RemainingIndex.__new__(RemainingIndex)
+        index.size = self.size
+        index.count_tree = self.count_tree.copy()
+        index.sum_tree = self.sum_tree.copy()
+        index.multiplicity = self.multiplicity.copy()
+        index.total_count = self.total_count
+        index.total_sum = self.total_sum
+        index.mask = self.mask
+        index._prefix_cache = {}
+        return index
+
+    def _update(self, num: int, count: int):
+        i = num
+        while i <= self.size:
+            self.count_tree[i] += count
+            self.sum_tree[i] += count * num
+            i += i & -i
+        self.multiplicity[num] += count
+        self._prefix_cache.clear()
+        self.total_count += count
+        self.total_sum += count * num
+        if self.multiplicity[num]:
+            self.mask |= 1 << (num - 1)
+        else:
+            self.mask &= ~(1 << (num - 1))
+
+    def add(self, num: int):
+        self._update(num, 1)
+
+    def remove(self, num: int):
+        if not self.multiplicity[num]:
+            raise ValueError(f"{num} is not remaining")
+        self._update(num, -1)
+
+    def _prefix(self, num: int) -> Tuple[int, int]:
+        """Count and sum of the remaining numbers 1..num."""
+        cached = self._prefix_cache.get(num)
+        if cached is not None:
+            return cached
+        count = total = 0
+        i = num if num < self.size else self.size
+        while i > 0:
+            count += self.count_tree[i]
+            total += self.sum_tree[i]
+            i -= i & -i
+        self._prefix_cache[num] = (count, total)
+        return count, total
+
+    def __len__(self) -> int:
+        return self.total_count
+
+    def __contains__(self, num: int) -> bool:
+        return 1 <= num <= self.size and self.multiplicity[num] > 0
+
+    def count_below(self, target_num: int) -> int:
+        return self._prefix(target_num - 1)[0]
+
+    def count_above(self, target_num: int) -> int:
+        return self.total_count - self._prefix(target_num)[0]
+
+    def sum_below(self, target_num: int) -> int:
+        return self._prefix(target_num - 1)[1]
+
+    def sum_above(self, target_num: int) -> int:
+        return self.total_sum - self._prefix(target_num)[1]
+
+    def mean_below(self, target_num: int) -> float:
+        """Mean of the numbers below target_num; raises ZeroDivisionError if there are none."""
+        count, total = self._prefix(target_num - 1)
+        return total / count
+
+    def mean_above(self, target_num: int) -> float:
+        """Mean of the numbers above target_num; raises ZeroDivisionError if there are none."""
+        count, total = self._prefix(target_num)
+        return (self.total_sum - total) / (self.total_count - count)
@@ -0,0 +1,63 @@
+import json
+from typing import Iterator, List, Tuple
+
+from push_your_luck_index import numbers_to_mask
+
+# One-letter action codes keep each log line short
+ACTION_CODES = {'higher': 'h', 'lower': 'l', 'bank': 'b'}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+# (score, bank, target_num, remaining_mask, action, next_num)
+Transition = Tuple[int, int, int, int, str, int]
+
+
+class GameLogWriter:
+    """Appends game transitions to a JSONL log, one compact array per line.
+
+    Each line is [score, bank, target_num, remaining_mask, action_code, next_num]
+    seen from the deciding player's side. next_num is 0 when the player banked
+    (including the automatic bank on the last number).
+    """
+    def __init__(self, filename: str, buffer_size: int = 1000):
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.buffer: List[str] = []
+        self.file = open(filename, 'a')
+
+    def record(self, score: int, bank: int, target_num: int, available_numbers: List[int],
+               action: str, next_num: int = 0):
+        """Buffer one transition, writing the buffer out once it is full."""
+        self.buffer.append(f"[{score},{bank},{target_num},{numbers_to_mask(available_numbers)},"
+                           f"\"{ACTION_CODES[action]}\",{next_num}]\n")
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered transitions to disk."""
+        if self.buffer:
+            self.file.write(''.join(self.buffer))
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        """Flush and close the log."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_transitions(*filenames: str) -> Iterator[Transition]:
+    """Stream transitions from one or more logs without loading them into memory."""
+    for filename in filenames:
+        with open(filename) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                score, bank, target_num, mask, code, next_num = json.loads(line)
+                yield score, bank, target_num, mask, CODE_ACTIONS[code], next_num
@@ -1,6 +1,10 @@
+import argparse
 import random
-from push_your_luck_solver import PushYourLuckSolver
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
+from push_your_luck_index import RemainingIndex
+
+if TYPE_CHECKING:
+    from push_your_luck_solver import PushYourLuckSolver
 
 class Player:
     def __init__(self, name: str, is_human: bool = False):
@@ -10,17 +14,24 @@ class Player:
         self.is_active = True
         self.is_human = is_human
 
+# Computer players take the game's RemainingIndex of available_numbers when the
+# game engine provides one, and build their own otherwise.
+
 class SafePlayer(Player):
     """A player that always chooses to bank."""
-    def get_guess(self, target_num: int, available_numbers: List[int]) -> str:
+    def get_guess(self, target_num: int, available_numbers: List[int],
+                  index: Optional[RemainingIndex] = None) -> str:
         return 'bank'
 
 class ProbabilityPlayer(Player):
     """A player that makes decisions based on probability calculations."""
-    def get_guess(self, target_num: int, available_numbers: List[int]) -> str:
-        higher_count = sum(1 for num in available_numbers if num > target_num)
-        lower_count = sum(1 for num in available_numbers if num < target_num)
-        total = len(available_numbers)
+    def get_guess(self, target_num: int, available_numbers: List[int],
+                  index: Optional[RemainingIndex] = None) -> str:
+        if index is None:
+            index = RemainingIndex(available_numbers)
+        higher_count = index.count_above(target_num)
+        lower_count = index.count_below(target_num)
+        total = len(index)
         
         higher_prob = higher_count / total
         lower_prob = lower_count / total
@@ -40,35 +51,40 @@ class ExpectedValuePlayer(Player):
         self.bank_threshold = bank_threshold  # Bank if expected payoffs are below this fraction of current bank
         self.payoff_threshold = payoff_threshold  # Bank if payoffs are within this fraction of each other
     
-    def calculate_expected_payoff(self, target_num: int, available_numbers: List[int], is_higher: bool) -> float:
+    def calculate_expected_payoff(self, target_num: int, available_numbers: List[int], is_higher: bool,
+                                  index: Optional[RemainingIndex] = None) -> float:
         """Calculate expected payoff for higher or lower guess."""
+        if index is None:
+            index = RemainingIndex(available_numbers)
         if is_higher:
-            valid_numbers = [num for num in available_numbers if num > target_num]
             # If target is largest, this is an impossible guess
-            if not valid_numbers:
+            if not index.count_above(target_num):
                 return float('-inf')  # Use negative infinity to ensure this option is never chosen
+            # Expected payoff is the average of all valid numbers
+            return index.mean_above(target_num)
         else:
-            valid_numbers = [num for num in available_numbers if num < target_num]
             # If target is smallest, this is an impossible guess
-            if not valid_numbers:
+            if not index.count_below(target_num):
                 return float('-inf')  # Use negative infinity to ensure this option is never chosen
-        
-        # Expected payoff is the average of all valid numbers
-        return sum(valid_numbers) / len(valid_numbers)
+            return index.mean_below(target_num)
     
-    def get_guess(self, target_num: int, available_numbers: List[int]) -> str:
+    def get_guess(self, target_num: int, available_numbers: List[int],
+                  index: Optional[RemainingIndex] = None) -> str:
+        if index is None:
+            index = RemainingIndex(available_numbers)
+        
         # Calculate expected payoffs
-        higher_payoff = self.calculate_expected_payoff(target_num, available_numbers, True)
-        lower_payoff = self.calculate_expected_payoff(target_num, available_numbers, False)
+        higher_payoff = self.calculate_expected_payoff(target_num, available_numbers, True, index)
+        lower_payoff = self.calculate_expected_payoff(target_num, available_numbers, False, index)
         
         # If both options are impossible (target is largest or smallest), bank
         if higher_payoff == float('-inf') and lower_payoff == float('-inf'):
             return 'bank'
         
         # Calculate probabilities
-        higher_count = sum(1 for num in available_numbers if num > target_num)
-        lower_count = sum(1 for num in available_numbers if num < target_num)
-        total = len(available_numbers)
+        higher_count = index.count_above(target_num)
+        lower_count = index.count_below(target_num)
+        total = len(index)
         
         higher_prob = higher_count / total
         lower_prob = lower_count / total
@@ -105,25 +121,49 @@ class ExpectedValuePlayer(Player):
         return 'higher' if weighted_higher > weighted_lower else 'lower'
 
 class AIPlayer(Player):
-    """A player that uses the trained Q-learning solver."""
-    def __init__(self, name: str):
+    """A player that uses the trained Q-learning solver.
+    
+    The solver and its model are loaded on the first decision rather than at
+    construction, so setting up a game does not wait on reading the model.
+    """
+    def __init__(self, name: str, model_file: str = "push_your_luck_model.pkl",
+                 solver: Optional['PushYourLuckSolver'] = None):
         super().__init__(name)
-        self.solver = PushYourLuckSolver()
-        self.solver.load_model()  # Load the trained model
-        self.solver.exploration_rate = 0  # Disable exploration for actual play
+        self.model_file = model_file
+        self._solver = solver
+        if solver is not None:
+            solver.exploration_rate = 0  # Disable exploration for actual play
     
-    def get_guess(self, target_num: int, available_numbers: List[int]) -> str:
-        state_key = self.solver.get_state_key(self.score, self.bank, target_num, available_numbers)
+    @property
+    def solver(self) -> 'PushYourLuckSolver':
+        if self._solver is None:
+            from push_your_luck_solver import PushYourLuckSolver
+            self._solver = PushYourLuckSolver()
+            self._solver.load_model(self.model_file)  # Load the trained model
+            self._solver.exploration_rate = 0  # Disable exploration for actual play
+        return self._solver
+    
+    def get_guess(self, target_num: int, available_numbers: List[int],
+                  index: Optional[RemainingIndex] = None) -> str:
+        if index is None:
+            state_key = self.solver.get_state_key(self.score, self.bank, target_num, available_numbers)
+        else:
+            state_key = self.solver.get_mask_state_key(self.score, self.bank, target_num, index.mask)
         return self.solver.get_action(state_key)
 
 class MixedPushYourLuckGame:
-    def __init__(self):
+    def __init__(self, game_log=None, verbose: bool = True, advisor=None):
         self.main_spinner = list(range(1, 14))  # [1, 2, ..., 13]
         self.players: List[Player] = []
         self.target_num = 0
         self.round_spinner = []
+        self.remaining = RemainingIndex()  # Counts and sums of round_spinner, updated as numbers are drawn
         self.game_over = False
         self.target_score = 100  # Using 100 as target score for multiplayer
+        self.game_log = game_log  # Optional GameLogWriter recording every player's moves
+        self.verbose = verbose  # Print the play-by-play; disable for headless simulations
+        self.advisor = advisor  # Optional StrategyAdvisor showing human players a hint
+        self.winner: Optional[Player] = None
     
     def add_player(self, player: Player):
         """Add a player to the game."""
@@ -134,6 +174,8 @@ class MixedPushYourLuckGame:
         self.round_spinner = self.main_spinner.copy()
         self.target_num = random.choice(self.round_spinner)
         self.round_spinner.remove(self.target_num)
+        self.remaining = RemainingIndex.full_spinner(len(self.main_spinner))
+        self.remaining.remove(self.target_num)
         
         # Reset player states for new round
         for player in self.players:
@@ -148,6 +190,9 @@ class MixedPushYourLuckGame:
             print(f"Target number: {self.target_num}")
             print(f"Current bank: {player.bank}")
             print(f"Current score: {player.score}")
+            if self.advisor is not None:
+                from push_your_luck_advisor import format_advice
+                print(format_advice(self.advisor.advise(player.bank, self.target_num, self.round_spinner)))
             
             guess = input("Enter your guess (higher/lower/bank): ").lower()
             if guess in ['higher', 'lower', 'bank']:
@@ -157,9 +202,23 @@ class MixedPushYourLuckGame:
     def play_round(self):
         """Play a single round of the game."""
         self.start_new_round()
-        print(f"\nNew round starting! Target number is: {self.target_num}")
+        if self.verbose:
+            print(f"\nNew round starting! Target number is: {self.target_num}")
         
         while any(p.is_active for p in self.players):
+            # Players still active after the last number bank automatically
+            if not self.round_spinner:
+                for player in self.players:
+                    if player.is_active:
+                        if self.game_log is not None:
+                            self.game_log.record(player.score, player.bank, self.target_num, self.round_spinner, 'bank')
+                        player.score += player.bank
+                        player.is_active = False
+                        if self.verbose:
+                            print(f"Last number! {player.name} banks {player.bank} points!")
+                self.check_winner()
+                return
+            
             # Get guesses from all active players
             guesses: Dict[Player, str] = {}
             
@@ -168,44 +227,86 @@ class MixedPushYourLuckGame:
                     if player.is_human:
                         guess = self.get_human_guess(player)
                     else:
-                        guess = player.get_guess(self.target_num, self.round_spinner)
-                        print(f"{player.name}'s turn (Score: {player.score}) - Chooses: {guess}")
+                        guess = player.get_guess(self.target_num, self.round_spinner, self.remaining)
+                        if self.verbose:
+                            print(f"{player.name}'s turn (Score: {player.score}) - Chooses: {guess}")
                     
                     guesses[player] = guess
             
             # Process all guesses
             next_num = random.choice(self.round_spinner)
-            print(f"\nNext number is: {next_num}")
+            if self.verbose:
+                print(f"\nNext number is: {next_num}")
             
             for player, guess in guesses.items():
+                if self.game_log is not None:
+                    self.game_log.record(player.score, player.bank, self.target_num, self.round_spinner,
+                                         guess, 0 if guess == 'bank' else next_num)
+                
                 if guess == 'bank':
                     player.score += player.bank
                     player.is_active = False
-                    print(f"{player.name} banks {player.bank} points!")
+                    if self.verbose:
+                        print(f"{player.name} banks {player.bank} points!")
                 elif (guess == 'higher' and next_num > self.target_num) or \
                      (guess == 'lower' and next_num < self.target_num):
                     player.bank += next_num
-                    print(f"{player.name} is correct! Bank is now {player.bank}")
+                    if self.verbose:
+                        print(f"{player.name} is correct! Bank is now {player.bank}")
                 else:
-                    print(f"{player.name} busts! Loses bank of {player.bank}")
+                    if self.verbose:
+                        print(f"{player.name} busts! Loses bank of {player.bank}")
                     player.is_active = False
             
             # Update target number and remove it from spinner
             self.target_num = next_num
             self.round_spinner.remove(next_num)
+            self.remaining.remove(next_num)
             
-            # Check for winner
-            for player in self.players:
-                if player.score >= self.target_score:
-                    self.game_over = True
+            if self.check_winner():
+                return
+    
+    def check_winner(self) -> bool:
+        """End the game if a player has reached the target score."""
+        for player in self.players:
+            if player.score >= self.target_score:
+                self.game_over = True
+                self.winner = player
+                if self.verbose:
                     print(f"\n{player.name} wins with {player.score} points!")
                     print("\nFinal Scores:")
                     for p in sorted(self.players, key=lambda x: x.score, reverse=True):
                         print(f"{p.name}: {p.score} points")
-                    return
+                return True
+        return False
+    
+    def play_game(self, max_rounds: Optional[int] = None) -> Optional[Player]:
+        """Play rounds until someone wins (or max_rounds is reached) and return the winner."""
+        rounds_played = 0
+        while not self.game_over:
+            if max_rounds is not None and rounds_played >= max_rounds:
+                break
+            self.play_round()
+            rounds_played += 1
+        return self.winner
 
 def main():
-    game = MixedPushYourLuckGame()
+    parser = argparse.ArgumentParser(description="Mixed Push Your Luck")
+    parser.add_argument('--log', help="append every player's moves to this game log")
+    parser.add_argument('--advisor', action='store_true', help="show the recommended move before each guess")
+    args = parser.parse_args()
+    
+    game_log = None
+    if args.log:
+        from push_your_luck_log import GameLogWriter
+        game_log = GameLogWriter(args.log)
+    
+    advisor = None
+    if args.advisor:
+        from push_your_luck_advisor import StrategyAdvisor
+        advisor = StrategyAdvisor(min_to_guess=1)  # Players may guess on the last number
+    
+    game = MixedPushYourLuckGame(game_log=game_log, advisor=advisor)
     
     # Add players
     human_name = input("Enter your name: ")
@@ -227,13 +328,17 @@ def main():
     print("\nFirst to reach 100 points wins!")
 
     # Main game loop
-    while not game.game_over:
-        game.play_round()
-        
-        if not game.game_over:
-            print("\nRound summary:")
-            for player in game.players:
-                print(f"{player.name}: {player.score} points")
+    try:
+        while not game.game_over:
+            game.play_round()
+            
+            if not game.game_over:
+                print("\nRound summary:")
+                for player in game.players:
+                    print(f"{player.name}: {player.score} points")
+    finally:
+        if game_log is not None:
+            game_log.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,216 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from push_your_luck_index import mask_to_numbers
+from push_your_luck_policyio import EXIT_OK, EXIT_ERROR, EXIT_GATE_FAILED, LOAD_ERRORS, CLIError, load_policy
+from push_your_luck_solver import ACTIONS, HIGHER, LOWER, BANK, UNKNOWN_ACTION, expand_mask, unpack_state_index
+
+# Within-round transition tables per spinner size, built on first use
+_round_graphs: Dict[int, Dict[str, Any]] = {}
+
+
+def round_graph(spinner_size: int = 13) -> Dict[str, Any]:
+    """Transitions between the in-round states (target, mask) of one score's block of state_index.
+
+    A state's offset within the block is (target - 1) << (spinner_size - 1) |
+    compress_mask(mask, target), the same layout compile_policy uses. Each edge
+    is one possible next number; edges are grouped by how many numbers remain
+    at the source, which only ever decreases within a round.
+    """
+    if spinner_size in _round_graphs:
+        return _round_graphs[spinner_size]
+
+    mask_bits = spinner_size - 1
+    block = spinner_size << mask_bits
+    offsets = np.arange(block)
+    targets = (offsets >> mask_bits) + 1
+    compressed = offsets & ((1 << mask_bits) - 1)
+    masks = np.array([expand_mask(int(c), int(t)) for c, t in zip(compressed, targets)], dtype=np.int64)
+    remaining = np.array([bin(int(m)).count('1') for m in masks], dtype=np.int64)
+    remaining_sum = np.zeros(block, dtype=np.int64)
+    for num in range(1, spinner_size + 1):
+        remaining_sum += ((masks >> (num - 1)) & 1) * num
+
+    sources, destinations, next_higher = [], [], []
+    for num in range(1, spinner_size + 1):
+        has_num = np.flatnonzero((masks >> (num - 1)) & 1)
+        new_masks = masks[has_num] ^ (1 << (num - 1))
+        low_bits = new_masks & ((1 << (num - 1)) - 1)
+        new_compressed = low_bits | ((new_masks >> num) << (num - 1))
+        sources.append(has_num)
+        destinations.append(((num - 1) << mask_bits) | new_compressed)
+        next_higher.append(num > targets[has_num])
+    sources = np.concatenate(sources)
+    destinations = np.concatenate(destinations)
+    next_higher = np.concatenate(next_higher)
+
+    levels = []
+    for count in range(spinner_size - 1, 1, -1):
+        # Players guess only while at least two numbers remain; otherwise they bank.
+        # Edges are sorted by destination so flows can be summed with reduceat.
+        edges = np.flatnonzero(remaining[sources] == count)
+        edges = edges[np.argsort(destinations[edges], kind='stable')]
+        targets_reached, starts = np.unique(destinations[edges], return_index=True)
+        # Each edge reads row source (lower guesses) or len(states) + source (higher
+        # guesses) of the level's stacked per-state flows
+        states = np.unique(sources[edges])
+        rows = np.searchsorted(states, sources[edges]) + next_higher[edges] * len(states)
+        levels.append((count, states, rows, targets_reached, starts))
+
+    graph = {
+        'block': block,
+        'remaining': remaining,
+        'bank': spinner_size * (spinner_size + 1) // 2 - remaining_sum,  # Sum of the numbers drawn so far
+        'start': np.array([((t - 1) << mask_bits) | ((1 << mask_bits) - 1) for t in range(1, spinner_size + 1)]),
+        'levels': levels,
+    }
+    _round_graphs[spinner_size] = graph
+    return graph
+
+
+def action_probabilities(policy: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Probabilities of higher, lower and bank; unknown states act uniformly at random, like get_action."""
+    unknown = (policy == UNKNOWN_ACTION) / 3.0
+    return (policy == HIGHER) + unknown, (policy == LOWER) + unknown, (policy == BANK) + unknown
+
+
+def policy_visits(policy: np.ndarray, target_score: int = 100, spinner_size: int = 13) -> Tuple[np.ndarray, float]:
+    """Exact expected visits per decision state in one greedy game, and the expected rounds to win.
+
+    Within a round, reach probabilities flow level by level through
+    round_graph. Across rounds, a bust restarts at the same score and a bank
+    moves to a higher one, so the expected rounds started at each score follow
+    in one pass over the scores. Returns visits as a float array laid out like
+    policy, and inf rounds if some reachable score can never be banked from.
+    """
+    graph = round_graph(spinner_size)
+    block = graph['block']
+    # State-major (state, score) layout, so gathering a state's row is contiguous
+    policy = np.asarray(policy[:target_score * block]).reshape(target_score, block).T
+    higher, lower, bank = action_probabilities(policy)
+    bank[graph['remaining'] < 2] = 1.0
+
+    # reach[state, s]: probability of reaching the state in a round started at score s
+    reach = np.zeros((block, target_score))
+    reach[graph['start']] = 1.0 / spinner_size
+    for count, states, rows, targets_reached, starts in graph['levels']:
+        level_reach = reach[states] / count
+        stacked = np.concatenate([level_reach * lower[states], level_reach * higher[states]])
+        reach[targets_reached] += np.add.reduceat(stacked[rows], starts, axis=0)
+
+    # banked[s, amount]: probability a round at score s ends by banking amount
+    max_bank = int(graph['bank'].max())
+    banked = np.zeros((target_score, max_bank + 1))
+    ending = reach * bank
+    for amount in np.unique(graph['bank']).tolist():
+        banked[:, amount] = ending[graph['bank'] == amount].sum(axis=0)
+
+    arrivals = np.zeros(target_score)
+    arrivals[0] = 1.0
+    rounds = np.zeros(target_score)
+    for s in range(target_score):
+        if arrivals[s] == 0:
+            continue
+        bank_probability = banked[s].sum()
+        if bank_probability < 1e-12:
+            return np.zeros(target_score * block), float('inf')
+        rounds[s] = arrivals[s] / bank_probability
+        reachable = min(max_bank, target_score - 1 - s)
+        arrivals[s + 1:s + reachable + 1] += rounds[s] * banked[s, 1:reachable + 1]
+    visits = (reach * rounds).T
+    return visits.ravel(), float(rounds.sum())
+
+
+def diff_policies(old: np.ndarray, new: np.ndarray, target_score: int = 100, spinner_size: int = 13,
+                  top: int = 20) -> Dict[str, Any]:
+    """Compare two packed greedy policies.
+
+    Changed states are weighted by their expected visits per game under the
+    new policy; rounds to win are exact expectations for both policies.
+    """
+    if len(old) != len(new):
+        raise ValueError("Policies have different sizes")
+    new_visits, new_rounds = policy_visits(new, target_score, spinner_size)
+    _, old_rounds = policy_visits(old, target_score, spinner_size)
+
+    size = len(new_visits)
+    changed = np.flatnonzero(np.asarray(old[:size]) != np.asarray(new[:size]))
+    changed_visits = new_visits[changed]
+    order = changed[np.argsort(-changed_visits, kind='stable')[:top]]
+    total = spinner_size * (spinner_size + 1) // 2
+
+    def describe(index: int) -> Dict[str, Any]:
+        score, target_num, mask = unpack_state_index(index, spinner_size)
+        numbers = mask_to_numbers(mask)
+        return {
+            'score': score,
+            'bank': total - sum(numbers),
+            'target': target_num,
+            'remaining': numbers,
+            'old_action': ACTIONS[old[index]] if old[index] != UNKNOWN_ACTION else None,
+            'new_action': ACTIONS[new[index]] if new[index] != UNKNOWN_ACTION else None,
+            'visits_per_game': float(new_visits[index]),
+        }
+
+    total_visits = new_visits.sum()
+    return {
+        'states': size,
+        'changed_states': len(changed),
+        'reachable_changed_states': int((changed_visits > 0).sum()),
+        'changed_visits_per_game': float(changed_visits.sum()),
+        'changed_decision_share': float(changed_visits.sum() / total_visits) if total_visits else 0.0,
+        'old_expected_rounds': old_rounds,
+        'new_expected_rounds': new_rounds,
+        'expected_rounds_change': new_rounds - old_rounds,
+        'top_changes': [describe(int(index)) for index in order if new_visits[index] > 0],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the greedy policies of two Push Your Luck models")
+    parser.add_argument('old', help="baseline model: pickle, or .npy/.npz policy export")
+    parser.add_argument('new', help="candidate model: pickle, or .npy/.npz policy export")
+    parser.add_argument('--top', type=int, default=20, help="changed states to list, by visits")
+    parser.add_argument('--max-rounds-increase', type=float,
+                        help=f"fail (exit {EXIT_GATE_FAILED}) if expected rounds to win grow by more than this")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        # Pickles are compiled one at a time, so only one Q-table is in memory at once;
+        # .npy exports are memory-mapped
+        for filename in (args.old, args.new):
+            if not os.path.exists(filename):
+                raise FileNotFoundError(f"Model file not found: {filename}")
+        with contextlib.redirect_stdout(sys.stderr):
+            old = load_policy(args.old)
+            new = load_policy(args.new)
+        report = diff_policies(old, new, top=args.top)
+    except (CLIError, OSError) + LOAD_ERRORS as error:
+        print(json.dumps({'error': str(error)}), file=sys.stderr)
+        return EXIT_ERROR
+    report['seconds'] = time.perf_counter() - start
+
+    exit_code = EXIT_OK
+    if args.max_rounds_increase is not None:
+        report['passed'] = report['expected_rounds_change'] <= args.max_rounds_increase
+        if not report['passed']:
+            exit_code = EXIT_GATE_FAILED
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report))
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
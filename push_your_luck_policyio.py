@@ -0,0 +1,48 @@
+import contextlib
+import os
+import pickle
+import sys
+
+from push_your_luck_solver import PushYourLuckSolver
+
+# Exit codes shared by the command-line tools; argparse itself exits with 2 on bad arguments
+EXIT_OK = 0
+EXIT_ERROR = 1  # Missing or unreadable input, unknown strategy, ...
+EXIT_USAGE = 2
+EXIT_GATE_FAILED = 3  # A check such as eval's --max-avg-rounds or policydiff's --max-rounds-increase failed
+
+# What reading a truncated, corrupt or wrong-format model or checkpoint can raise
+LOAD_ERRORS = (pickle.UnpicklingError, EOFError, ValueError, KeyError, TypeError)
+
+
+class CLIError(Exception):
+    """An error reported as {"error": ...} on stderr with EXIT_ERROR."""
+
+
+def load_solver(model_file: str) -> PushYourLuckSolver:
+    """Load a pickled model, failing instead of silently starting from an empty Q-table."""
+    if not os.path.exists(model_file):
+        raise CLIError(f"Model file not found: {model_file}")
+    solver = PushYourLuckSolver()
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            solver.load_model(model_file)
+    except LOAD_ERRORS as error:
+        raise CLIError(f"Cannot read model file {model_file}: {error!r}")
+    return solver
+
+
+def load_policy(filename: str):
+    """Load a packed policy from a .npy export (memory-mapped), a compressed .npz export, or compile one from a pickled model.
+
+    Pickles go through load_solver, so a missing or corrupt model raises CLIError
+    instead of compiling an empty Q-table into an all-unknown policy.
+    """
+    import numpy as np
+
+    if filename.endswith('.npy'):
+        return np.load(filename, mmap_mode='r')
+    if filename.endswith('.npz'):
+        with np.load(filename) as exported:
+            return exported['policy']
+    return load_solver(filename).compile_policy()
@@ -0,0 +1,287 @@
+import argparse
+import json
+import os
+import queue
+import random
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from push_your_luck_index import RemainingIndex, numbers_to_mask
+from push_your_luck_mixed import AIPlayer
+from push_your_luck_policyio import EXIT_OK, EXIT_ERROR, LOAD_ERRORS, CLIError, load_policy
+from push_your_luck_solver import ACTIONS, UNKNOWN_ACTION, state_index, num_states
+
+DEFAULT_SOCKET = '/tmp/push_your_luck_policy.sock'
+
+# Wire protocol: one request per line, "score target_num remaining_mask", answered
+# with one action per line. Connections are persistent, so a client sends many.
+# Lines that are not three integers, or a batch that fails, are answered with ERROR_REPLY.
+ERROR_REPLY = 'error'
+
+
+class _PendingRequest:
+    """A decision waiting for the batcher; the handler thread blocks on event."""
+    __slots__ = ('index', 'action', 'event')
+
+    def __init__(self, index: int):
+        self.index = index
+        self.action = None
+        self.event = threading.Event()
+
+
+class _PolicyRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server.policy_server
+        server.connection_opened()
+        try:
+            for line in self.rfile:
+                try:
+                    score, target_num, mask = (int(field) for field in line.split())
+                except ValueError:
+                    self.wfile.write(ERROR_REPLY.encode() + b'\n')
+                    continue
+                pending = server.submit(score, target_num, mask)
+                pending.event.wait()
+                self.wfile.write(pending.action.encode() + b'\n')
+        finally:
+            server.connection_closed()
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class PolicyServer:
+    """Holds one copy of a packed policy and answers get_action requests in micro-batches.
+
+    Requests from all connections go into one queue. A batcher thread takes up to
+    max_batch of them, waiting at most max_delay seconds for the batch to fill,
+    and resolves the whole batch with one vectorized array lookup. Each connection
+    has at most one request in flight, so the wait ends early once every open
+    connection is represented in the batch.
+    """
+    def __init__(self, policy: np.ndarray, socket_path: str = DEFAULT_SOCKET,
+                 max_batch: int = 256, max_delay: float = 0.0005,
+                 target_score: int = 100, spinner_size: int = 13):
+        if len(policy) != num_states(target_score, spinner_size):
+            raise ValueError("Policy size does not match the target score and spinner size")
+        self.policy = policy
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.target_score = target_score
+        self.spinner_size = spinner_size
+        self.requests: queue.Queue = queue.Queue()
+        self.batches = 0
+        self.batched_requests = 0
+        self.connections = 0
+        self._connections_lock = threading.Lock()
+        self._running = False
+        self._server: Optional[_ThreadingUnixServer] = None
+        self._threads: List[threading.Thread] = []
+
+    def connection_opened(self):
+        with self._connections_lock:
+            self.connections += 1
+
+    def connection_closed(self):
+        with self._connections_lock:
+            self.connections -= 1
+
+    def submit(self, score: int, target_num: int, mask: int) -> _PendingRequest:
+        """Queue a decision; out-of-range states are answered like unknown ones.
+
+        A mask with bits beyond the spinner, or with the target's own bit set,
+        is out of range too: the target is never among the remaining numbers.
+        """
+        if 0 <= score < self.target_score and 1 <= target_num <= self.spinner_size and \
+           0 <= mask < 1 << self.spinner_size and not (mask >> (target_num - 1)) & 1:
+            index = state_index(score, target_num, mask, self.spinner_size)
+        else:
+            index = -1
+        pending = _PendingRequest(index)
+        self.requests.put(pending)
+        return pending
+
+    def _batch_loop(self):
+        while self._running:
+            try:
+                batch = [self.requests.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.perf_counter() + self.max_delay
+            while len(batch) < min(self.max_batch, self.connections):
+                timeout = deadline - time.perf_counter()
+                try:
+                    if timeout > 0:
+                        batch.append(self.requests.get(timeout=timeout))
+                    else:
+                        batch.append(self.requests.get_nowait())
+                except queue.Empty:
+                    break
+            self._resolve(batch)
+
+    def _resolve(self, batch: List[_PendingRequest]):
+        try:
+            indices = np.fromiter((pending.index for pending in batch), dtype=np.int64, count=len(batch))
+            valid = indices >= 0
+            actions = np.full(len(batch), UNKNOWN_ACTION, dtype=np.int8)
+            actions[valid] = self.policy[indices[valid]]
+            for pending, action in zip(batch, actions.tolist()):
+                # Unknown states get a random action, as PushYourLuckSolver.get_action does
+                pending.action = ACTIONS[action] if action != UNKNOWN_ACTION else random.choice(ACTIONS)
+                pending.event.set()
+        except Exception:
+            # Fail only this batch's requests; the batcher keeps serving the others
+            for pending in batch:
+                if not pending.event.is_set():
+                    pending.action = ERROR_REPLY
+                    pending.event.set()
+        self.batches += 1
+        self.batched_requests += len(batch)
+
+    def start(self):
+        """Start listening and batching in background threads."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _ThreadingUnixServer(self.socket_path, _PolicyRequestHandler)
+        self._server.policy_server = self
+        self._running = True
+        self._threads = [threading.Thread(target=self._batch_loop, daemon=True),
+                         threading.Thread(target=self._server.serve_forever, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stop serving and remove the socket."""
+        self._running = False
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class PolicyClient:
+    """A persistent connection to a PolicyServer."""
+    def __init__(self, socket_path: str = DEFAULT_SOCKET):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.reader = self.sock.makefile('rb')
+
+    def get_action(self, score: int, target_num: int, mask: int) -> str:
+        self.sock.sendall(f"{score} {target_num} {mask}\n".encode())
+        return self.reader.readline().decode().strip()
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+class RemoteAIPlayer(AIPlayer):
+    """An AIPlayer that asks a shared policy server for its decisions instead of loading the model."""
+    def __init__(self, name: str, socket_path: str = DEFAULT_SOCKET):
+        super().__init__(name)
+        self.client = PolicyClient(socket_path)
+
+    def get_guess(self, target_num: int, available_numbers: List[int],
+                  index: Optional[RemainingIndex] = None) -> str:
+        mask = index.mask if index is not None else numbers_to_mask(available_numbers)
+        return self.client.get_action(self.score, target_num, mask)
+
+
+def load_test(socket_path: str = DEFAULT_SOCKET, clients: int = 8, requests_per_client: int = 2000,
+              seed: int = 0) -> Dict[str, float]:
+    """Hammer the server from concurrent clients and report throughput and latency."""
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+
+    def run_client(slot: int):
+        rng = random.Random(seed + slot)
+        client = PolicyClient(socket_path)
+        try:
+            for _ in range(requests_per_client):
+                target_num = rng.randint(1, 13)
+                mask = rng.getrandbits(13) & ~(1 << (target_num - 1))
+                start = time.perf_counter()
+                client.get_action(rng.randrange(100), target_num, mask)
+                latencies[slot].append(time.perf_counter() - start)
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=run_client, args=(slot,)) for slot in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = sorted(latency for client_latencies in latencies for latency in client_latencies)
+    return {
+        'requests': len(all_latencies),
+        'seconds': elapsed,
+        'throughput': len(all_latencies) / elapsed,
+        'p50_ms': all_latencies[len(all_latencies) // 2] * 1000,
+        'p99_ms': all_latencies[min(len(all_latencies) - 1, int(len(all_latencies) * 0.99))] * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local policy inference service for Push Your Luck")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="Unix socket path")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help="serve a trained policy")
+    serve.add_argument('--model', default="push_your_luck_model.pkl", help="pickled model or .npy policy")
+    serve.add_argument('--max-batch', type=int, default=256)
+    serve.add_argument('--max-delay-ms', type=float, default=0.5)
+
+    bench = subparsers.add_parser('loadtest', help="measure a running server")
+    bench.add_argument('--clients', type=int, default=8)
+    bench.add_argument('--requests', type=int, default=2000, help="requests per client")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        # Fail before listening rather than serve random answers from a model that did not load
+        try:
+            policy = load_policy(args.model)
+        except (CLIError, OSError) + LOAD_ERRORS as error:
+            print(json.dumps({'error': str(error)}), file=sys.stderr)
+            return EXIT_ERROR
+        server = PolicyServer(policy, args.socket,
+                              max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+        server.start()
+        print(f"Serving {args.model} on {args.socket} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+            if server.batches:
+                print(f"{server.batched_requests} requests in {server.batches} batches "
+                      f"(avg batch {server.batched_requests / server.batches:.1f})")
+    else:
+        stats = load_test(args.socket, args.clients, args.requests)
+        print(f"{stats['requests']} requests in {stats['seconds']:.2f}s: "
+              f"{stats['throughput']:.0f} req/s, p50 {stats['p50_ms']:.3f} ms, p99 {stats['p99_ms']:.3f} ms")
+    return EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
+import argparse
 import random
 
 class PushYourLuckGame:
-    def __init__(self):
+    def __init__(self, game_log=None, advisor=None):
         self.main_spinner = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]
         #self.main_spinner = [1, 2, 3, 4, 5] #smaller list for testing
         self.score = 0
@@ -9,6 +10,8 @@ class PushYourLuckGame:
         self.target_num = 0
         self.round_spinner = []
         self.game_over = False
+        self.game_log = game_log  # Optional GameLogWriter recording every transition
+        self.advisor = advisor  # Optional StrategyAdvisor showing a hint before each guess
 
     def start_new_round(self):
         # Reset round state
@@ -40,15 +43,22 @@ class PushYourLuckGame:
             print(f"Target number: {self.target_num}")
             print(f"Current bank: {self.bank}")
             print(f"Your score: {self.score}")
+            if self.advisor is not None:
+                from push_your_luck_advisor import format_advice
+                print(format_advice(self.advisor.advise(self.bank, self.target_num, self.round_spinner)))
             
             guess = input("Enter your guess (higher/lower/bank): ").lower()
             
             if len(self.round_spinner) < 2:
+                if self.game_log is not None:
+                    self.game_log.record(self.score, self.bank, self.target_num, self.round_spinner, 'bank')
                 self.score += self.bank
                 print(f"Congratulations, you won the whole round and banked {self.bank} points!")
                 return
 
             if guess == 'bank':
+                if self.game_log is not None:
+                    self.game_log.record(self.score, self.bank, self.target_num, self.round_spinner, 'bank')
                 self.score += self.bank
                 print(f"\nYou banked {self.bank} points!")
                 return
@@ -59,6 +69,8 @@ class PushYourLuckGame:
 
             next_num = random.choice(self.round_spinner)
             #next_num = self.round_spinner[0]
+            if self.game_log is not None:
+                self.game_log.record(self.score, self.bank, self.target_num, self.round_spinner, guess, next_num)
             print(f"\nNext number is: {next_num}")
             
             if (guess == 'higher' and next_num > self.target_num) or \
@@ -72,13 +84,32 @@ class PushYourLuckGame:
                 return
 
 def main():
-    game = PushYourLuckGame()
+    parser = argparse.ArgumentParser(description="Single Player Push Your Luck")
+    parser.add_argument('--log', help="append every move to this game log")
+    parser.add_argument('--advisor', action='store_true', help="show the recommended move before each guess")
+    args = parser.parse_args()
+    
+    game_log = None
+    if args.log:
+        from push_your_luck_log import GameLogWriter
+        game_log = GameLogWriter(args.log)
+    
+    advisor = None
+    if args.advisor:
+        from push_your_luck_advisor import StrategyAdvisor
+        advisor = StrategyAdvisor(min_to_guess=2)  # The last number banks automatically
+    
+    game = PushYourLuckGame(game_log=game_log, advisor=advisor)
     print("Welcome to Single Player Push Your Luck!")
     print("Try to reach 50 points by guessing if the next number will be higher or lower.")
     print("Bank your points when you want to play it safe!")
     
-    while not game.game_over:
-        game.play_round()
+    try:
+        while not game.game_over:
+            game.play_round()
+    finally:
+        if game_log is not None:
+            game_log.close()
         
 
         #if not game.game_over:
@@ -1,12 +1,62 @@
-import numpy as np
 import random
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
+import heapq
 import pickle
-from typing import List, Tuple, Dict
+import sys
+from typing import List, Tuple, Dict, Optional
 import time
+from push_your_luck_index import RemainingIndex, mask_to_numbers
+
+# numpy is imported where it is used so that the interactive games importing
+# this module reach their first prompt quickly.
+
+# Action order used by packed policies: policy[state_index] is an index into this list
+ACTIONS = ['higher', 'lower', 'bank']
+HIGHER, LOWER, BANK = range(3)  # Positions in ACTIONS
+UNKNOWN_ACTION = -1  # Packed policy entry for a state the Q-table has never updated
+
+UPDATE_MODES = ('q', 'double', 'nstep')
+
+def compress_mask(mask: int, target_num: int) -> int:
+    """Drop the target's bit from a remaining-number mask; the target is never remaining."""
+    low_bits = mask & ((1 << (target_num - 1)) - 1)
+    return low_bits | ((mask >> target_num) << (target_num - 1))
+
+def expand_mask(compressed: int, target_num: int) -> int:
+    """Inverse of compress_mask: re-insert the target's (clear) bit."""
+    low_bits = compressed & ((1 << (target_num - 1)) - 1)
+    return low_bits | ((compressed >> (target_num - 1)) << target_num)
+
+def state_index(score: int, target_num: int, mask: int, spinner_size: int = 13) -> int:
+    """Pack a decision state into a dense integer index.
+    
+    The bank is left out because within a round it always equals the sum of the
+    numbers already drawn, which (target, mask) determines.
+    """
+    return ((score * spinner_size + target_num - 1) << (spinner_size - 1)) | compress_mask(mask, target_num)
+
+def num_states(target_score: int = 100, spinner_size: int = 13) -> int:
+    """Size of the dense state index for scores below target_score."""
+    return (target_score * spinner_size) << (spinner_size - 1)
+
+def unpack_state_index(index: int, spinner_size: int = 13) -> Tuple[int, int, int]:
+    """Inverse of state_index: return (score, target_num, mask)."""
+    score, target_offset = divmod(index >> (spinner_size - 1), spinner_size)
+    compressed = index & ((1 << (spinner_size - 1)) - 1)
+    return score, target_offset + 1, expand_mask(compressed, target_offset + 1)
+
+# Comma-joined remaining numbers per mask, the last field of a Q-table key
+_mask_key_cache: Dict[int, str] = {}
+
+def parse_state_key(state: str) -> Tuple[int, int, int, List[int]]:
+    """Split a Q-table key back into (score, bank, target_num, available_numbers)."""
+    score, bank, target_num, numbers = state.split('_')
+    return int(score), int(bank), int(target_num), [int(num) for num in numbers.split(',') if num]
 
 class PushYourLuckSolver:
-    def __init__(self, learning_rate=0.1, discount_factor=0.95, exploration_rate=1.0, min_exploration_rate=0.01, exploration_decay=0.995):
+    def __init__(self, learning_rate=0.1, discount_factor=0.95, exploration_rate=1.0, min_exploration_rate=0.01, exploration_decay=0.995,
+                 max_entries: Optional[int] = None, eviction_policy: str = 'lru',
+                 update_mode: str = 'q', n_steps: int = 3):
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.exploration_rate = exploration_rate
@@ -17,29 +67,203 @@ class PushYourLuckSolver:
         #self.main_spinner = [1, 2, 3, 4, 5]  # smaller spinner for testing
         self.target_score = 100
         
+        # Bounded mode: cap the number of states kept in the Q-table
+        if eviction_policy not in ('lru', 'visits'):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+        self.max_entries = max_entries
+        self.eviction_policy = eviction_policy
+        self.update_order = OrderedDict()  # States in least-recently-updated order
+        self.visit_counts = defaultdict(int)  # Number of updates per state
+        
+        # How train() learns from each transition:
+        #   'q'      one-step Q-learning
+        #   'double' double Q-learning; two tables, each evaluating the other's greedy
+        #            action, with q_table holding their mean for acting and saving
+        #   'nstep'  n-step returns chained across rounds, so the win reward reaches
+        #            the n_steps decisions before it in a single episode
+        if update_mode not in UPDATE_MODES:
+            raise ValueError(f"Unknown update mode: {update_mode}")
+        self.update_mode = update_mode
+        self.n_steps = n_steps
+        self.double_tables = (defaultdict(lambda: defaultdict(float)), defaultdict(lambda: defaultdict(float))) \
+            if update_mode == 'double' else None
+        self.pending_steps = deque()  # [state, action, reward] awaiting their n-step return
+        
     def get_state_key(self, score: int, bank: int, target_num: int, available_numbers: List[int]) -> str:
         """Convert the game state into a string key for the Q-table."""
         return f"{score}_{bank}_{target_num}_{','.join(map(str, sorted(available_numbers)))}"
     
+    def get_mask_state_key(self, score: int, bank: int, target_num: int, mask: int) -> str:
+        """Same key as get_state_key, for remaining numbers given as a RemainingIndex mask."""
+        numbers = _mask_key_cache.get(mask)
+        if numbers is None:
+            numbers = _mask_key_cache[mask] = ','.join(map(str, mask_to_numbers(mask)))
+        return f"{score}_{bank}_{target_num}_{numbers}"
+    
     def get_action(self, state: str) -> str:
         """Choose an action using epsilon-greedy strategy."""
         if random.random() < self.exploration_rate:
             return random.choice(['higher', 'lower', 'bank'])
         else:
-            actions = self.q_table[state]
+            actions = self.q_table.get(state)
             if not actions:
                 return random.choice(['higher', 'lower', 'bank'])
             return max(actions.items(), key=lambda x: x[1])[0]
     
     def update_q_value(self, state: str, action: str, reward: float, next_state: str):
-        """Update Q-value using the Q-learning formula."""
+        """Update Q-value using the Q-learning formula (double Q-learning in 'double' mode)."""
+        if self.double_tables is not None:
+            self._update_double(state, action, reward, next_state)
+            return
+        # Look up next_state without inserting it; only updated states belong in the table
+        next_actions = self.q_table.get(next_state)
+        next_max_q = max(next_actions.values()) if next_actions else 0
+        self._update_towards(state, action, reward + self.discount_factor * next_max_q)
+    
+    def _update_towards(self, state: str, action: str, target: float):
+        """Move Q(state, action) a learning-rate step towards target."""
+        if self.max_entries is not None:
+            self._record_update(state)
         current_q = self.q_table[state][action]
-        next_max_q = max(self.q_table[next_state].values()) if self.q_table[next_state] else 0
-        new_q = current_q + self.learning_rate * (reward + self.discount_factor * next_max_q - current_q)
-        self.q_table[state][action] = new_q
+        self.q_table[state][action] = current_q + self.learning_rate * (target - current_q)
+    
+    def _update_double(self, state: str, action: str, reward: float, next_state: str):
+        """Double Q-learning: update one table at random, valuing its greedy next action with the other."""
+        if self.max_entries is not None:
+            self._record_update(state)
+        learner, evaluator = self.double_tables
+        if random.random() < 0.5:
+            learner, evaluator = evaluator, learner
+        for table in self.double_tables:
+            if state not in table:
+                # Start from q_table so a loaded model keeps its values
+                table[state] = defaultdict(float, self.q_table.get(state, {}))
+        
+        next_max_q = 0
+        next_actions = learner.get(next_state)
+        if next_actions:
+            best = max(next_actions.items(), key=lambda x: x[1])[0]
+            next_max_q = evaluator[next_state].get(best, 0)
+        current_q = learner[state][action]
+        learner[state][action] = current_q + self.learning_rate * (reward + self.discount_factor * next_max_q - current_q)
+        self.q_table[state][action] = (learner[state][action] + evaluator[state][action]) / 2
+    
+    def _learn(self, state: str, action: str, reward: float, next_state: str):
+        """Learn from one training transition according to update_mode."""
+        if self.update_mode != 'nstep':
+            self.update_q_value(state, action, reward, next_state)
+            return
+        # state is the bootstrap state for the decision n_steps back; a round
+        # boundary does not end the chain, the next round's first state follows
+        if len(self.pending_steps) >= self.n_steps:
+            next_actions = self.q_table.get(state)
+            self._apply_n_step_return(max(next_actions.values()) if next_actions else 0)
+        self.pending_steps.append([state, action, reward])
+    
+    def _learn_win(self, state: str, action: str, next_state: str):
+        """Give the winning decision the win reward and finish the episode's updates."""
+        if self.update_mode != 'nstep':
+            self.update_q_value(state, action, 100, next_state)
+            return
+        self.pending_steps[-1][2] += 100
+        while self.pending_steps:
+            self._apply_n_step_return(0)
+    
+    def _apply_n_step_return(self, bootstrap: float):
+        """Update the oldest pending decision with its discounted return plus a bootstrapped tail."""
+        target = bootstrap
+        for _, _, reward in reversed(self.pending_steps):
+            target = reward + self.discount_factor * target
+        state, action, _ = self.pending_steps.popleft()
+        self._update_towards(state, action, target)
+    
+    def _record_update(self, state: str):
+        """Track recency and visits for state, evicting others to stay under max_entries."""
+        if state not in self.q_table and len(self.q_table) >= self.max_entries:
+            self._evict(len(self.q_table) - self.max_entries + 1)
+        self.update_order[state] = None
+        self.update_order.move_to_end(state)
+        self.visit_counts[state] += 1
+    
+    def _evict(self, count: int):
+        """Remove count states chosen by the eviction policy."""
+        if self.eviction_policy == 'lru':
+            victims = [self.update_order.popitem(last=False)[0] for _ in range(min(count, len(self.update_order)))]
+        else:
+            # Evict a tenth of the table at once so the O(n) scan is amortised
+            count = max(count, self.max_entries // 10)
+            victims = heapq.nsmallest(count, self.q_table, key=lambda s: self.visit_counts.get(s, 0))
+        for victim in victims:
+            self.q_table.pop(victim, None)
+            self.update_order.pop(victim, None)
+            self.visit_counts.pop(victim, None)
+            if self.double_tables is not None:
+                for table in self.double_tables:
+                    table.pop(victim, None)
+    
+    def _reset_tracking(self):
+        """Rebuild eviction bookkeeping after the Q-table was replaced."""
+        self.update_order = OrderedDict((state, None) for state in self.q_table)
+        self.visit_counts = defaultdict(int)
+        if self.double_tables is not None:
+            # Reseeded from q_table state by state on their next update
+            self.double_tables = (defaultdict(lambda: defaultdict(float)), defaultdict(lambda: defaultdict(float)))
+        if self.max_entries is not None and len(self.q_table) > self.max_entries:
+            self._evict(len(self.q_table) - self.max_entries)
+    
+    def memory_stats(self) -> Dict[str, int]:
+        """Return entry counts and an approximate memory footprint of the Q-table."""
+        state_actions = 0
+        empty_states = 0
+        terminal_states = 0
+        approx_bytes = sys.getsizeof(self.q_table)
+        for state, actions in self.q_table.items():
+            state_actions += len(actions)
+            if not actions:
+                empty_states += 1
+            if self.is_terminal_placeholder(state):
+                terminal_states += 1
+            approx_bytes += sys.getsizeof(state) + sys.getsizeof(actions)
+            approx_bytes += sum(sys.getsizeof(value) for value in actions.values())
+        return {
+            'states': len(self.q_table),
+            'state_actions': state_actions,
+            'empty_states': empty_states,
+            'terminal_states': terminal_states,
+            'approx_bytes': approx_bytes,
+        }
+    
+    @staticmethod
+    def is_terminal_placeholder(state: str) -> bool:
+        """Check for the end-of-round state written as get_state_key(score, 0, 0, [])."""
+        return state.endswith('_0_0_')
     
-    def train(self, num_episodes: int = 10000):
-        """Train the solver by playing multiple games."""
+    def prune(self, verbose: bool = True) -> int:
+        """Drop never-updated and terminal placeholder entries; return how many were removed."""
+        before = self.memory_stats()
+        victims = [state for state, actions in self.q_table.items()
+                   if not actions or self.is_terminal_placeholder(state)]
+        for victim in victims:
+            del self.q_table[victim]
+            self.update_order.pop(victim, None)
+            self.visit_counts.pop(victim, None)
+            if self.double_tables is not None:
+                for table in self.double_tables:
+                    table.pop(victim, None)
+        
+        if verbose:
+            after = self.memory_stats()
+            print("Q-table memory before and after pruning:")
+            for name in before:
+                print(f"  {name}: {before[name]} -> {after[name]}")
+        return len(victims)
+    
+    def train(self, num_episodes: int = 10000, verbose: bool = True, game_log=None):
+        """Train the solver by playing multiple games.
+        
+        If game_log (a GameLogWriter) is given, every transition is recorded to it.
+        Transitions are learned from according to update_mode.
+        """
         wins = 0
         total_rounds = 0
         
@@ -53,40 +277,51 @@ class PushYourLuckSolver:
                 round_spinner = self.main_spinner.copy()
                 target_num = random.choice(round_spinner)
                 round_spinner.remove(target_num)
+                remaining = RemainingIndex.full_spinner(len(self.main_spinner))
+                remaining.remove(target_num)
                 bank = target_num
                 rounds_played += 1
                 
                 while True:
                     # Get current state
-                    current_state = self.get_state_key(score, bank, target_num, round_spinner)
+                    current_state = self.get_mask_state_key(score, bank, target_num, remaining.mask)
                     
                     # Choose action
                     action = self.get_action(current_state)
                     
                     # Take action
                     if action == 'bank':
+                        if game_log is not None:
+                            game_log.record(score, bank, target_num, round_spinner, 'bank')
                         score += bank
                         reward = -1  # Penalty for each round
                         next_state = self.get_state_key(score, 0, 0, [])  # Game will start new round
-                        self.update_q_value(current_state, action, reward, next_state)
+                        self._learn(current_state, action, reward, next_state)
                         break
                     
                     if len(round_spinner) < 2:
+                        # Banking automatically is learned as a bank, win reward included, as in train_offline
+                        action = 'bank'
+                        if game_log is not None:
+                            game_log.record(score, bank, target_num, round_spinner, action)
                         score += bank
                         reward = -1  # Round penalty
                         next_state = self.get_state_key(score, 0, 0, [])
-                        self.update_q_value(current_state, 'bank', reward, next_state)
+                        self._learn(current_state, action, reward, next_state)
                         break
                     
                     next_num = random.choice(round_spinner)
+                    if game_log is not None:
+                        game_log.record(score, bank, target_num, round_spinner, action, next_num)
                     round_spinner.remove(next_num)
+                    remaining.remove(next_num)
                     
                     if (action == 'higher' and next_num > target_num) or \
                        (action == 'lower' and next_num < target_num):
                         bank += next_num
                         target_num = next_num
                         reward = 3  # Reward for correct guess
-                        next_state = self.get_state_key(score, bank, target_num, round_spinner)
+                        next_state = self.get_mask_state_key(score, bank, target_num, remaining.mask)
                     else:
                         reward = -2  # Bust penalty
                         next_state = self.get_state_key(score, 0, 0, [])
@@ -95,7 +330,7 @@ class PushYourLuckSolver:
                     if action != 'bank':
                         reward -= 1  # Round penalty
                     
-                    self.update_q_value(current_state, action, reward, next_state)
+                    self._learn(current_state, action, reward, next_state)
                     
                     if reward == -3:  # Bust (-2) + Round penalty (-1)
                         break
@@ -103,8 +338,7 @@ class PushYourLuckSolver:
                 if score >= self.target_score:
                     game_over = True
                     wins += 1
-                    reward = 100  # Big reward for winning
-                    self.update_q_value(current_state, action, reward, next_state)
+                    self._learn_win(current_state, action, next_state)  # Big reward (+100) for winning
             
             total_rounds += rounds_played
             
@@ -112,7 +346,7 @@ class PushYourLuckSolver:
             self.exploration_rate = max(self.min_exploration_rate, 
                                      self.exploration_rate * self.exploration_decay)
             
-            if (episode + 1) % 100 == 0:
+            if verbose and (episode + 1) % 100 == 0:
                 win_rate = wins / (episode + 1) * 100
                 avg_rounds = total_rounds / (episode + 1)
                 print(f"Episode {episode + 1}/{num_episodes}")
@@ -121,6 +355,60 @@ class PushYourLuckSolver:
                 print(f"Exploration rate: {self.exploration_rate:.3f}")
                 print("---")
     
+    def train_offline(self, *filenames: str, epochs: int = 1, verbose: bool = True):
+        """Fit the Q-table from recorded game logs instead of live simulation.
+        
+        Transitions are streamed from disk, so memory use does not grow with the
+        size of the logs. Rewards follow the same structure as train().
+        """
+        from push_your_luck_log import read_transitions
+        
+        for epoch in range(epochs):
+            count = 0
+            for score, bank, target_num, mask, action, next_num in read_transitions(*filenames):
+                current_state = self.get_mask_state_key(score, bank, target_num, mask)
+                
+                if action == 'bank' or next_num == 0:
+                    next_state = self.get_state_key(score + bank, 0, 0, [])
+                    self.update_q_value(current_state, 'bank', -1, next_state)
+                    if score + bank >= self.target_score:
+                        self.update_q_value(current_state, 'bank', 100, next_state)
+                elif (action == 'higher' and next_num > target_num) or \
+                     (action == 'lower' and next_num < target_num):
+                    next_state = self.get_mask_state_key(score, bank + next_num, next_num, mask & ~(1 << (next_num - 1)))
+                    self.update_q_value(current_state, action, 3 - 1, next_state)
+                else:
+                    next_state = self.get_state_key(score, 0, 0, [])
+                    self.update_q_value(current_state, action, -2 - 1, next_state)
+                count += 1
+            
+            if verbose:
+                print(f"Epoch {epoch + 1}/{epochs}: {count} transitions")
+    
+    def compile_policy(self):
+        """Pack the greedy policy into a NumPy int8 array indexed by state_index.
+        
+        Entries hold an index into ACTIONS, or UNKNOWN_ACTION for states the
+        Q-table has no values for. Assumes main_spinner is 1..N.
+        """
+        import numpy as np
+        
+        spinner_size = len(self.main_spinner)
+        policy = np.full(num_states(self.target_score, spinner_size), UNKNOWN_ACTION, dtype=np.int8)
+        for state, actions in self.q_table.items():
+            if not actions:
+                continue
+            score, _, target_num, numbers = parse_state_key(state)
+            if target_num == 0 or score >= self.target_score:
+                continue
+            mask = 0
+            for num in numbers:
+                mask |= 1 << (num - 1)
+            # Same tie-breaking as get_action: the first action with the highest value
+            best = max(actions.items(), key=lambda x: x[1])[0]
+            policy[state_index(score, target_num, mask, spinner_size)] = ACTIONS.index(best)
+        return policy
+    
     def save_model(self, filename: str = "push_your_luck_model.pkl"):
         """Save the trained Q-table to a file."""
         with open(filename, 'wb') as f:
@@ -131,21 +419,32 @@ class PushYourLuckSolver:
         try:
             with open(filename, 'rb') as f:
                 self.q_table = defaultdict(lambda: defaultdict(float), pickle.load(f))
+            self._reset_tracking()
             print("Model loaded successfully!")
         except FileNotFoundError:
             print("No saved model found.")
     
-    def play_game(self, verbose: bool = True) -> Tuple[int, int]:
-        """Play a single game using the learned strategy."""
+    def play_game(self, verbose: bool = True, max_rounds: Optional[int] = None, game_log=None) -> Tuple[int, int]:
+        """Play a single game using the learned strategy.
+        
+        If max_rounds is given, the game is abandoned after that many rounds
+        so that a policy which never banks cannot stall an evaluation.
+        If game_log (a GameLogWriter) is given, every transition is recorded to it.
+        """
         score = 0
         rounds_played = 0
         game_over = False
         
         while not game_over:
+            if max_rounds is not None and rounds_played >= max_rounds:
+                break
+            
             # Start new round
             round_spinner = self.main_spinner.copy()
             target_num = random.choice(round_spinner)
             round_spinner.remove(target_num)
+            remaining = RemainingIndex.full_spinner(len(self.main_spinner))
+            remaining.remove(target_num)
             bank = target_num
             rounds_played += 1
             
@@ -156,7 +455,7 @@ class PushYourLuckSolver:
                 print(f"Available numbers: {round_spinner}")
             
             while True:
-                current_state = self.get_state_key(score, bank, target_num, round_spinner)
+                current_state = self.get_mask_state_key(score, bank, target_num, remaining.mask)
                 action = self.get_action(current_state)
                 
                 if verbose:
@@ -164,19 +463,26 @@ class PushYourLuckSolver:
                     print(f"Action chosen: {action}")
                 
                 if action == 'bank':
+                    if game_log is not None:
+                        game_log.record(score, bank, target_num, round_spinner, 'bank')
                     score += bank
                     if verbose:
                         print(f"Banked {bank} points! New score: {score}")
                     break
                 
                 if len(round_spinner) < 2:
+                    if game_log is not None:
+                        game_log.record(score, bank, target_num, round_spinner, 'bank')
                     score += bank
                     if verbose:
                         print(f"Last number! Banked {bank} points! New score: {score}")
                     break
                 
                 next_num = random.choice(round_spinner)
+                if game_log is not None:
+                    game_log.record(score, bank, target_num, round_spinner, action, next_num)
                 round_spinner.remove(next_num)
+                remaining.remove(next_num)
                 
                 if verbose:
                     print(f"Next number: {next_num}")
@@ -213,6 +519,9 @@ def main():
     training_time = time.time() - start_time
     print(f"\nTraining completed in {training_time:.2f} seconds")
     
+    # Drop placeholder entries before saving
+    solver.prune()
+    
     # Save the trained model
     solver.save_model()
     
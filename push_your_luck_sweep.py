@@ -0,0 +1,252 @@
+import argparse
+import ast
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import push_your_luck_solver
+from push_your_luck_solver import PushYourLuckSolver
+
+# Constructor arguments of PushYourLuckSolver that a sweep may vary
+HYPERPARAMETERS = ['learning_rate', 'discount_factor', 'exploration_rate',
+                   'min_exploration_rate', 'exploration_decay', 'update_mode', 'n_steps']
+
+DEFAULT_CACHE_DIR = '.sweep_cache'
+
+
+def training_sources(module_file: str = push_your_luck_solver.__file__) -> List[str]:
+    """module_file and every local module it imports, directly or indirectly, anywhere in the file."""
+    directory = os.path.dirname(os.path.abspath(module_file))
+    pending = [os.path.abspath(module_file)]
+    sources = set()
+    while pending:
+        filename = pending.pop()
+        if filename in sources:
+            continue
+        sources.add(filename)
+        with open(filename, 'rb') as f:
+            tree = ast.parse(f.read(), filename)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                local_file = os.path.join(directory, name.split('.')[0] + '.py')
+                if os.path.exists(local_file):
+                    pending.append(local_file)
+    return sorted(sources)
+
+
+def code_version() -> str:
+    """Hash the solver and the local modules it uses, so cached results are invalidated when they change."""
+    digest = hashlib.sha256()
+    for filename in training_sources():
+        digest.update(os.path.basename(filename).encode() + b'\0')
+        with open(filename, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def expand_spec(spec: Dict[str, Any]) -> List[Dict[str, float]]:
+    """Turn a grid or random search spec into a list of solver configs.
+
+    Grid spec:   {"search": "grid", "params": {"learning_rate": [0.05, 0.1]}}
+    Random spec: {"search": "random", "samples": 20, "seed": 0,
+                  "params": {"learning_rate": {"low": 0.01, "high": 0.5, "log": true},
+                             "discount_factor": [0.9, 0.95, 0.99]}}
+    In a random spec a list means "choose one of these values".
+    """
+    params = spec.get('params', {})
+    unknown = set(params) - set(HYPERPARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown hyperparameters: {', '.join(sorted(unknown))}")
+
+    search = spec.get('search', 'grid')
+    if search == 'grid':
+        names = sorted(params)
+        return [dict(zip(names, values))
+                for values in itertools.product(*(params[name] for name in names))]
+
+    if search == 'random':
+        rng = random.Random(spec.get('seed', 0))
+        configs = []
+        for _ in range(spec.get('samples', 10)):
+            config = {}
+            for name in sorted(params):
+                domain = params[name]
+                if isinstance(domain, list):
+                    config[name] = rng.choice(domain)
+                elif domain.get('log'):
+                    config[name] = 10 ** rng.uniform(math.log10(domain['low']), math.log10(domain['high']))
+                else:
+                    config[name] = rng.uniform(domain['low'], domain['high'])
+            configs.append(config)
+        return configs
+
+    raise ValueError(f"Unknown search type: {search}")
+
+
+def cache_key(config: Dict[str, float], seed: int, episodes: int, eval_games: int, version: str) -> str:
+    """Key a sweep point by its config, seed, budget and code version."""
+    payload = json.dumps({'config': config, 'seed': seed, 'episodes': episodes,
+                          'eval_games': eval_games, 'version': version}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def run_point(config: Dict[str, float], seed: int, episodes: int, eval_games: int,
+              max_rounds: int = 200) -> Dict[str, Any]:
+    """Train and evaluate a single configuration. Runs inside a worker process."""
+    random.seed(seed)
+    solver = PushYourLuckSolver(**config)
+    solver.train(num_episodes=episodes, verbose=False)
+
+    # Evaluate greedily, the same way AIPlayer uses the model
+    solver.exploration_rate = 0
+    total_rounds = 0
+    wins = 0
+    for _ in range(eval_games):
+        score, rounds = solver.play_game(verbose=False, max_rounds=max_rounds)
+        total_rounds += rounds
+        if score >= solver.target_score:
+            wins += 1
+
+    return {
+        'config': config,
+        'seed': seed,
+        'episodes': episodes,
+        'eval_games': eval_games,
+        'win_rate': wins / eval_games,
+        'avg_rounds': total_rounds / eval_games,
+        'q_table_size': len(solver.q_table),
+    }
+
+
+class SweepRunner:
+    """Runs a hyperparameter sweep across a process pool with an on-disk result cache."""
+    def __init__(self, episodes: int = 2000, eval_games: int = 200, seeds: Optional[List[int]] = None,
+                 workers: Optional[int] = None, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.episodes = episodes
+        self.eval_games = eval_games
+        self.seeds = seeds if seeds is not None else [0]
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.version = code_version()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._cache_path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _store(self, key: str, result: Dict[str, Any]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write then rename so an interrupted sweep never leaves a truncated entry
+        tmp_path = self._cache_path(key) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, self._cache_path(key))
+
+    def run(self, configs: List[Dict[str, float]], verbose: bool = True) -> List[Dict[str, Any]]:
+        """Evaluate every (config, seed) point, skipping those already cached."""
+        results = []
+        pending = {}
+        for config in configs:
+            for seed in self.seeds:
+                key = cache_key(config, seed, self.episodes, self.eval_games, self.version)
+                cached = self._load_cached(key)
+                if cached is not None:
+                    results.append(cached)
+                else:
+                    pending[key] = (config, seed)
+
+        if verbose:
+            print(f"{len(results)} cached, {len(pending)} to run")
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(run_point, config, seed, self.episodes, self.eval_games): key
+                           for key, (config, seed) in pending.items()}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    result = future.result()
+                    self._store(futures[future], result)
+                    results.append(result)
+                    if verbose:
+                        print(f"[{done}/{len(pending)}] {result['config']} seed={result['seed']} "
+                              f"avg rounds {result['avg_rounds']:.2f}")
+
+        return results
+
+
+def rank_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Average results over seeds and rank configs by rounds to win (fewer is better)."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for result in results:
+        grouped.setdefault(json.dumps(result['config'], sort_keys=True), []).append(result)
+
+    ranked = []
+    for key, runs in grouped.items():
+        ranked.append({
+            'config': json.loads(key),
+            'seeds': len(runs),
+            'avg_rounds': sum(r['avg_rounds'] for r in runs) / len(runs),
+            'win_rate': sum(r['win_rate'] for r in runs) / len(runs),
+        })
+    ranked.sort(key=lambda r: (r['avg_rounds'], -r['win_rate']))
+    return ranked
+
+
+def format_value(value: Any) -> str:
+    return f"{value:.4g}" if isinstance(value, (int, float)) else str(value)
+
+
+def format_table(ranked: List[Dict[str, Any]]) -> str:
+    """Render ranked results as a plain-text table."""
+    names = [name for name in HYPERPARAMETERS if any(name in r['config'] for r in ranked)]
+    header = ['rank'] + names + ['seeds', 'avg_rounds', 'win_rate']
+    rows = [header]
+    for rank, result in enumerate(ranked, start=1):
+        rows.append([str(rank)]
+                    + [format_value(result['config'][name]) if name in result['config'] else '-' for name in names]
+                    + [str(result['seeds']), f"{result['avg_rounds']:.2f}", f"{result['win_rate'] * 100:.1f}%"])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return '\n'.join('  '.join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep for the Push Your Luck solver")
+    parser.add_argument('spec', help="JSON file with a grid or random search spec")
+    parser.add_argument('--episodes', type=int, default=2000, help="training episodes per point")
+    parser.add_argument('--eval-games', type=int, default=200, help="greedy games used to score a point")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0], help="random seeds per config")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="directory for cached results")
+    parser.add_argument('--output', help="also write the ranked results to this JSON file")
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        configs = expand_spec(json.load(f))
+
+    runner = SweepRunner(episodes=args.episodes, eval_games=args.eval_games, seeds=args.seeds,
+                         workers=args.workers, cache_dir=args.cache_dir)
+    ranked = rank_results(runner.run(configs))
+    print()
+    print(format_table(ranked))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(ranked, f, indent=2)
+
+if __name__ == "__main__":
+    main()
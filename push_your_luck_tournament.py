@@ -0,0 +1,178 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from push_your_luck_mixed import (
+    Player, SafePlayer, ProbabilityPlayer, ExpectedValuePlayer, AIPlayer,
+    MixedPushYourLuckGame
+)
+from push_your_luck_policyio import CLIError, load_solver
+
+DEFAULT_STRATEGIES = ['safe', 'probability', 'ev']
+
+# Trained models loaded once per worker process, keyed by file name
+_solver_cache: Dict[str, object] = {}
+
+
+def make_player(spec: str) -> Player:
+    """Build a computer player from a strategy spec.
+
+    Specs: 'safe', 'probability', 'ev', 'ev:<bank_threshold>:<payoff_threshold>'
+    and 'ai:<model file>'. The spec doubles as the player's name.
+    """
+    kind, _, arg = spec.partition(':')
+    if kind == 'safe':
+        return SafePlayer(spec)
+    if kind == 'probability':
+        return ProbabilityPlayer(spec)
+    if kind == 'ev':
+        if arg:
+            bank_threshold, payoff_threshold = (float(value) for value in arg.split(':'))
+            return ExpectedValuePlayer(spec, bank_threshold, payoff_threshold)
+        return ExpectedValuePlayer(spec)
+    if kind == 'ai':
+        model_file = arg or "push_your_luck_model.pkl"
+        if model_file not in _solver_cache:
+            try:
+                # load_solver raises on failure; what it prints is the success message, which
+                # workers would repeat once per process
+                with contextlib.redirect_stderr(io.StringIO()):
+                    _solver_cache[model_file] = load_solver(model_file)
+            except CLIError as error:
+                raise ValueError(str(error))
+        return AIPlayer(spec, solver=_solver_cache[model_file])
+    raise ValueError(f"Unknown strategy: {spec}")
+
+
+def play_match(seats: Tuple[str, ...], seed: int, max_rounds: int = 500) -> Dict[str, object]:
+    """Play one headless mixed game. Runs inside a worker process."""
+    random.seed(seed)
+    game = MixedPushYourLuckGame(verbose=False)
+    for spec in seats:
+        game.add_player(make_player(spec))
+    winner = game.play_game(max_rounds=max_rounds)
+    return {
+        'seats': list(seats),
+        'scores': [player.score for player in game.players],
+        'winner': winner.name if winner is not None else None,
+    }
+
+
+def schedule(strategies: List[str], table_size: int, games_per_table: int, seed: int = 0) -> List[Tuple[Tuple[str, ...], int]]:
+    """List every combination of table_size strategies, games_per_table times each.
+
+    The first seat to reach the target wins, so the seating rotates from game
+    to game: over table_size games each strategy sits in every seat once.
+    """
+    rng = random.Random(seed)
+    return [(table[game % table_size:] + table[:game % table_size], rng.randrange(2 ** 32))
+            for table in itertools.combinations(strategies, table_size)
+            for game in range(games_per_table)]
+
+
+class EloRatings:
+    """Incremental multiplayer Elo: each game counts as every pairwise duel at the table."""
+    def __init__(self, k_factor: float = 32.0, initial_rating: float = 1500.0):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+        self.ratings: Dict[str, float] = {}
+        self.games: Dict[str, int] = {}
+        self.wins: Dict[str, int] = {}
+        self.total_score: Dict[str, int] = {}
+
+    def update(self, result: Dict[str, object]):
+        """Fold one game result into the ratings."""
+        seats = result['seats']
+        scores = result['scores']
+        for spec, score in zip(seats, scores):
+            self.ratings.setdefault(spec, self.initial_rating)
+            self.games[spec] = self.games.get(spec, 0) + 1
+            self.wins[spec] = self.wins.get(spec, 0) + (spec == result['winner'])
+            self.total_score[spec] = self.total_score.get(spec, 0) + score
+
+        # The winner beats everyone; other seats are ordered by final score
+        def placing(i: int) -> Tuple[bool, int]:
+            return seats[i] == result['winner'], scores[i]
+
+        k = self.k_factor / (len(seats) - 1)
+        deltas = [0.0] * len(seats)
+        for i, j in itertools.combinations(range(len(seats)), 2):
+            expected = 1 / (1 + 10 ** ((self.ratings[seats[j]] - self.ratings[seats[i]]) / 400))
+            if placing(i) > placing(j):
+                actual = 1.0
+            elif placing(i) < placing(j):
+                actual = 0.0
+            else:
+                actual = 0.5
+            deltas[i] += k * (actual - expected)
+            deltas[j] -= k * (actual - expected)
+        for spec, delta in zip(seats, deltas):
+            self.ratings[spec] += delta
+
+    def leaderboard(self) -> List[Dict[str, object]]:
+        """Return strategies sorted by rating."""
+        board = [{
+            'strategy': spec,
+            'rating': round(rating, 1),
+            'games': self.games[spec],
+            'wins': self.wins[spec],
+            'win_rate': self.wins[spec] / self.games[spec],
+            'avg_score': self.total_score[spec] / self.games[spec],
+        } for spec, rating in self.ratings.items()]
+        board.sort(key=lambda row: row['rating'], reverse=True)
+        return board
+
+
+def run_tournament(strategies: List[str], table_size: int = 3, games_per_table: int = 100,
+                   seed: int = 0, workers: Optional[int] = None, verbose: bool = True) -> EloRatings:
+    """Play a round-robin over every seat combination and rate the strategies."""
+    if table_size < 2 or table_size > len(strategies):
+        raise ValueError(f"Table size must be between 2 and {len(strategies)}")
+
+    for spec in strategies:
+        make_player(spec)  # Reject unknown strategies and unloadable models before starting the pool
+    matches = schedule(strategies, table_size, games_per_table, seed)
+    ratings = EloRatings()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        seats, seeds = zip(*matches)
+        # map yields in submission order, so ratings do not depend on worker timing
+        results = pool.map(play_match, seats, seeds, chunksize=max(1, len(matches) // 64))
+        for done, result in enumerate(results, start=1):
+            ratings.update(result)
+            if verbose and done % 100 == 0:
+                print(f"{done}/{len(matches)} games played")
+    return ratings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between Push Your Luck strategies")
+    parser.add_argument('strategies', nargs='*', default=DEFAULT_STRATEGIES,
+                        help="strategy specs: safe, probability, ev[:bank:payoff], ai[:model.pkl]")
+    parser.add_argument('--table-size', type=int, default=3, help="players per game")
+    parser.add_argument('--games', type=int, default=100,
+                        help="games per strategy combination (a multiple of the table size seats everyone evenly)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--output', default='leaderboard.json', help="leaderboard JSON file")
+    args = parser.parse_args()
+
+    try:
+        ratings = run_tournament(args.strategies, args.table_size, args.games, args.seed, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+    board = ratings.leaderboard()
+    with open(args.output, 'w') as f:
+        json.dump(board, f, indent=2)
+
+    print("\nLeaderboard:")
+    for rank, row in enumerate(board, start=1):
+        print(f"{rank}. {row['strategy']}: {row['rating']} "
+              f"({row['wins']}/{row['games']} wins, avg score {row['avg_score']:.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import random
+from typing import List, Optional
+
+import numpy as np
+
+from push_your_luck_index import RemainingIndex
+from push_your_luck_mixed import Player, AIPlayer
+from push_your_luck_solver import ACTIONS, HIGHER, LOWER, BANK
+
+# Guess codes stored in the per-spin guess array: positions in the solver's ACTIONS
+GUESS_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class VectorizedMixedGame:
+    """MixedPushYourLuckGame for huge tables of computer players.
+
+    Players are stored as parallel NumPy arrays (score, bank, active flag and
+    strategy id) instead of Player objects. Each strategy is one prototype
+    Player that is asked for a guess once per spin for its whole group of
+    seats. AI seats are the exception and are asked one at a time: the solver's
+    get_action draws random numbers on every call and picks a random action in
+    states its model has never seen, so each seat needs its own draws.
+    Banking, busting and winner detection are then one array operation per
+    spin. Every active seat has the same bank, since they all started from the
+    same target and guessed every spin correctly.
+
+    Rules and random draws match MixedPushYourLuckGame, so the same seed gives
+    the same game.
+    """
+    def __init__(self, target_score: int = 100):
+        self.main_spinner = list(range(1, 14))  # [1, 2, ..., 13]
+        self.target_score = target_score
+        self.strategies: List[Player] = []
+        self.seat_strategies: List[int] = []
+        self.target_num = 0
+        self.round_spinner: List[int] = []
+        self.remaining = RemainingIndex()  # Counts and sums of round_spinner, shared by every strategy
+        self.game_over = False
+        self.winner: Optional[int] = None  # Seat index of the winner
+
+        self.score = np.zeros(0, dtype=np.int64)
+        self.bank = np.zeros(0, dtype=np.int64)
+        self.active = np.zeros(0, dtype=bool)
+        self.strategy_id = np.zeros(0, dtype=np.int64)
+
+    def add_players(self, prototype: Player, count: int = 1) -> int:
+        """Seat count players that all follow prototype's strategy; return the strategy id."""
+        self.strategies.append(prototype)
+        strategy = len(self.strategies) - 1
+        self.seat_strategies.extend([strategy] * count)
+        self.score = np.concatenate([self.score, np.zeros(count, dtype=np.int64)])
+        self.bank = np.concatenate([self.bank, np.zeros(count, dtype=np.int64)])
+        self.active = np.concatenate([self.active, np.zeros(count, dtype=bool)])
+        self.strategy_id = np.asarray(self.seat_strategies, dtype=np.int64)
+        return strategy
+
+    def player_name(self, seat: int) -> str:
+        return f"{self.strategies[self.strategy_id[seat]].name} #{seat}"
+
+    def start_new_round(self):
+        """Reset round state and every seat's bank and active flag."""
+        self.round_spinner = self.main_spinner.copy()
+        self.target_num = random.choice(self.round_spinner)
+        self.round_spinner.remove(self.target_num)
+        self.remaining = RemainingIndex.full_spinner(len(self.main_spinner))
+        self.remaining.remove(self.target_num)
+        self.active[:] = True
+        self.bank[:] = self.target_num
+
+    def get_guesses(self) -> np.ndarray:
+        """Guess codes for every seat, computed once per strategy group (per seat for the AI)."""
+        guesses = np.full(len(self.score), BANK, dtype=np.int8)
+        shared_bank = int(self.bank[self.active][0])
+        ai_seats = np.zeros(len(self.score), dtype=bool)
+        for strategy, prototype in enumerate(self.strategies):
+            group = self.active & (self.strategy_id == strategy)
+            if not group.any():
+                continue
+            prototype.bank = shared_bank
+            if isinstance(prototype, AIPlayer):
+                ai_seats |= group
+            else:
+                guesses[group] = GUESS_CODES[prototype.get_guess(self.target_num, self.round_spinner, self.remaining)]
+        # In seat order, so the random draws go to the same seats as in MixedPushYourLuckGame
+        for seat in np.flatnonzero(ai_seats).tolist():
+            prototype = self.strategies[self.strategy_id[seat]]
+            prototype.score = int(self.score[seat])
+            guesses[seat] = GUESS_CODES[prototype.get_guess(self.target_num, self.round_spinner, self.remaining)]
+        return guesses
+
+    def play_round(self):
+        """Play a single round for all seats."""
+        self.start_new_round()
+
+        while self.active.any():
+            # Seats still active after the last number bank automatically
+            if not self.round_spinner:
+                self.score[self.active] += self.bank[self.active]
+                self.active[:] = False
+                self.check_winner()
+                return
+
+            guesses = self.get_guesses()
+            next_num = random.choice(self.round_spinner)
+
+            banking = self.active & (guesses == BANK)
+            if next_num > self.target_num:
+                correct = self.active & (guesses == HIGHER)
+            else:
+                correct = self.active & (guesses == LOWER)
+            self.score[banking] += self.bank[banking]
+            self.bank[correct] += next_num
+            self.active &= correct
+
+            self.target_num = next_num
+            self.round_spinner.remove(next_num)
+            self.remaining.remove(next_num)
+
+            if self.check_winner():
+                return
+
+    def check_winner(self) -> bool:
+        """End the game if any seat has reached the target score; the lowest seat wins ties."""
+        winners = np.flatnonzero(self.score >= self.target_score)
+        if len(winners):
+            self.game_over = True
+            self.winner = int(winners[0])
+            return True
+        return False
+
+    def play_game(self, max_rounds: Optional[int] = None) -> Optional[int]:
+        """Play rounds until a seat wins (or max_rounds is reached) and return its index."""
+        rounds_played = 0
+        while not self.game_over:
+            if max_rounds is not None and rounds_played >= max_rounds:
+                break
+            self.play_round()
+            rounds_played += 1
+        return self.winner
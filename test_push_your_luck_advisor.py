@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from push_your_luck_advisor import StrategyAdvisor, build_advice_table, format_advice
+
+class TestStrategyAdvisor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build both advice tables once for all tests."""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.single = StrategyAdvisor(os.path.join(cls.tmp_dir.name, "single.bin"), min_to_guess=2)
+        cls.mixed = StrategyAdvisor(os.path.join(cls.tmp_dir.name, "mixed.bin"), min_to_guess=1)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.single.close()
+        cls.mixed.close()
+        cls.tmp_dir.cleanup()
+    
+    def test_smallest_target(self):
+        """Test that guessing higher from 1 is recommended and can never bust."""
+        advice = self.single.advise(1, 1, list(range(2, 14)))
+        self.assertEqual(advice['action'], 'higher')
+        self.assertEqual(advice['bust_higher'], 0.0)
+        self.assertEqual(advice['bust_lower'], 1.0)
+        self.assertEqual(advice['ev_lower'], 0.0)
+        self.assertGreater(advice['ev_higher'], 1)
+    
+    def test_bust_probabilities(self):
+        """Test bust probabilities for a middle target."""
+        advice = self.single.advise(7, 7, [1, 2, 3, 4, 5, 6, 8, 9, 10, 11, 12, 13])
+        self.assertAlmostEqual(advice['bust_higher'], 0.5)
+        self.assertAlmostEqual(advice['bust_lower'], 0.5)
+    
+    def test_last_number(self):
+        """Test the last-number rule of each table."""
+        # Single player: one number left banks automatically
+        advice = self.single.advise(90, 1, [13])
+        self.assertEqual(advice['action'], 'bank')
+        # Mixed game: one number left can be guessed with certainty
+        advice = self.mixed.advise(78, 1, [13])
+        self.assertEqual(advice['action'], 'higher')
+        self.assertAlmostEqual(advice['ev_higher'], 91)
+    
+    def test_large_bank(self):
+        """Test that a large bank late in a round is banked."""
+        advice = self.single.advise(85, 3, [1, 5])
+        self.assertEqual(advice['action'], 'bank')
+    
+    def test_rebuild_is_not_needed(self):
+        """Test that an existing table file is reused."""
+        filename = os.path.join(self.tmp_dir.name, "single.bin")
+        mtime = os.path.getmtime(filename)
+        StrategyAdvisor(filename).close()
+        self.assertEqual(os.path.getmtime(filename), mtime)
+    
+    def test_build_advice_table(self):
+        """Test that building a table directly writes the same file the advisor builds, replacing it atomically."""
+        filename = os.path.join(self.tmp_dir.name, "rebuilt.bin")
+        build_advice_table(filename, min_to_guess=2)
+        self.assertNotIn("rebuilt.bin.tmp", os.listdir(self.tmp_dir.name))
+        with open(filename, 'rb') as rebuilt, open(os.path.join(self.tmp_dir.name, "single.bin"), 'rb') as single:
+            self.assertEqual(rebuilt.read(), single.read())
+    
+    def test_format_advice(self):
+        """Test that the hint mentions the action and bust odds."""
+        hint = format_advice(self.single.advise(7, 7, [1, 2, 3, 4, 5, 6, 8, 9, 10, 11, 12, 13]))
+        self.assertIn('higher', hint)
+        self.assertIn('50% bust', hint)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from push_your_luck_bestresponse import BestResponseSolver, RoundModel, head_to_head, table_win_rate
+from push_your_luck_index import numbers_to_mask
+
+class TestBestResponse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Solve against the EV player from the second seat on a 5-number spinner with a target of 20."""
+        cls.solver = BestResponseSolver('ev', target_score=20, spinner_size=5, ai_first=False)
+        cls.solver.solve(workers=1, verbose=False)
+
+    def test_matches_simulation(self):
+        """Test the solved win probability against games played by the best response."""
+        games = 3000
+        win_rate = head_to_head(self.solver, games, seed=1)
+        expected = self.solver.win_probability()
+        std_error = (expected * (1 - expected) / games) ** 0.5
+        self.assertLess(abs(win_rate - expected), 4 * std_error)
+        self.assertGreater(win_rate, head_to_head(self.solver, games, seed=1, baseline='probability'))
+
+    def test_mixed_table(self):
+        """Test the response to a table of two different opponents against the heads-up bound and baselines."""
+        solvers = [BestResponseSolver('probability', target_score=20, spinner_size=5, ai_first=False), self.solver]
+        solvers[0].solve(workers=1, verbose=False)
+        games = 2000
+        win_rate = table_win_rate(solvers, games, seed=1)
+        # Beating both opponents is no likelier than beating the stronger one alone
+        bound = min(solver.win_probability() for solver in solvers)
+        self.assertLess(win_rate, bound + 4 * (bound * (1 - bound) / games) ** 0.5)
+        # Following whichever opponent leads on score, regardless of who is still in the round, wins about 0.61
+        self.assertGreater(win_rate, 0.65)
+        for baseline in ('probability', 'ev', 'safe'):
+            self.assertLess(table_win_rate(solvers, games, seed=1, baseline=baseline), 0.1)
+        with self.assertRaises(ValueError):
+            table_win_rate([self.solver, BestResponseSolver('ev', target_score=20, spinner_size=5)], 1)
+
+    def test_values_are_monotone(self):
+        """Test that more points never hurt us and never help the leader."""
+        values = self.solver.values
+        self.assertTrue((np.diff(values, axis=0) >= -1e-9).all())
+        self.assertTrue((np.diff(values, axis=1) <= 1e-9).all())
+
+    def test_first_seat_can_copy(self):
+        """Test that from the first seat, shadowing the opponent on the shared spinner always wins."""
+        solver = BestResponseSolver('probability', target_score=20, spinner_size=5, ai_first=True)
+        solver.solve(workers=1, verbose=False)
+        self.assertAlmostEqual(solver.win_probability(), 1.0)
+
+    def test_plays_against_the_leader(self):
+        """Test that a leader about to win makes us bet on its bust instead of the likelier guess."""
+        mask = numbers_to_mask([1, 3, 4, 5])
+        self.assertEqual(self.solver.get_action(5, 5, True, 2, mask), 'higher')
+        # EV guesses higher here and would bank enough to win; only a 1 stops it
+        self.assertEqual(self.solver.get_action(5, 15, True, 2, mask), 'lower')
+
+    def test_workers_and_save(self):
+        """Test that a pooled solve matches the single-process one and survives a save and load."""
+        solver = BestResponseSolver('ev', target_score=20, spinner_size=5, ai_first=False)
+        solver.solve(workers=2, verbose=False)
+        np.testing.assert_array_equal(solver.values, self.solver.values)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'br.npz')
+            solver.save(filename)
+            loaded = BestResponseSolver.load(filename)
+        self.assertEqual((loaded.opponent, loaded.target_score, loaded.spinner_size, loaded.ai_first),
+                         ('ev', 20, 5, False))
+        np.testing.assert_array_equal(loaded.values, solver.values)
+
+    def test_rejects_score_dependent_opponents(self):
+        """Test that Q-learning opponents, whose moves depend on scores, are refused."""
+        with self.assertRaises(ValueError):
+            RoundModel('ai:push_your_luck_model.pkl', target_score=20, spinner_size=5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from push_your_luck_cli import main, EXIT_OK, EXIT_ERROR, EXIT_USAGE, EXIT_GATE_FAILED
+from push_your_luck_policyio import load_policy
+
+class TestBatchCLI(unittest.TestCase):
+    def setUp(self):
+        """Train a small model in a scratch directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model = os.path.join(self.tmp_dir.name, "model.pkl")
+        self.checkpoint = os.path.join(self.tmp_dir.name, "checkpoint.pkl")
+        code, self.trained = self.run_cli('train', '--episodes', '60', '--model', self.model,
+                                          '--checkpoint', self.checkpoint, '--checkpoint-every', '25')
+        self.assertEqual(code, EXIT_OK)
+    
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+    
+    def run_cli(self, *argv):
+        """Run the CLI and return its exit code and parsed JSON output."""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            code = main(list(argv))
+        output = stdout.getvalue()
+        return code, json.loads(output) if output else None
+    
+    def test_train_and_resume(self):
+        """Test that training saves a model and resumes from its checkpoint."""
+        self.assertTrue(os.path.exists(self.model))
+        self.assertEqual(self.trained['episodes_done'], 60)
+        code, resumed = self.run_cli('train', '--episodes', '20', '--model', self.model,
+                                     '--checkpoint', self.checkpoint)
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(resumed['resumed_from'], 60)
+        self.assertEqual(resumed['episodes_done'], 80)
+        self.assertLess(resumed['exploration_rate'], self.trained['exploration_rate'])
+    
+    def test_eval_gate(self):
+        """Test that eval reports JSON and exits non-zero when a gate is missed."""
+        code, result = self.run_cli('eval', '--model', self.model, '--games', '10')
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(result['games'], 10)
+        self.assertTrue(result['passed'])
+        self.assertEqual(self.run_cli('eval', '--model', self.model, '--games', '10')[1]['avg_rounds'],
+                         result['avg_rounds'], "Same seed should give the same evaluation")
+        
+        code, result = self.run_cli('eval', '--model', self.model, '--games', '10', '--max-avg-rounds', '1')
+        self.assertEqual(code, EXIT_GATE_FAILED)
+        self.assertFalse(result['passed'])
+    
+    def test_missing_model(self):
+        """Test that a missing model is an error rather than an empty Q-table."""
+        code, result = self.run_cli('eval', '--model', os.path.join(self.tmp_dir.name, "missing.pkl"))
+        self.assertEqual(code, EXIT_ERROR)
+        self.assertIsNone(result)
+    
+    def test_bad_input(self):
+        """Test that non-positive counts are usage errors and unreadable files are JSON errors."""
+        with contextlib.redirect_stderr(io.StringIO()):
+            for argv in (['eval', '--model', self.model, '--games', '0'],
+                         ['train', '--episodes', '-5'], ['simulate', 'ev', '--workers', '0']):
+                with self.assertRaises(SystemExit) as raised:
+                    main(argv)
+                self.assertEqual(raised.exception.code, EXIT_USAGE)
+        
+        corrupt = os.path.join(self.tmp_dir.name, "corrupt.pkl")
+        with open(corrupt, 'wb') as f:
+            f.write(b"not a pickle")
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(stderr):
+            self.assertEqual(main(['eval', '--model', corrupt]), EXIT_ERROR)
+            self.assertEqual(main(['train', '--episodes', '5', '--model', self.model, '--checkpoint', corrupt]),
+                             EXIT_ERROR)
+            # A single-process pickle checkpoint is not a multi-worker checkpoint
+            self.assertEqual(main(['train', '--episodes', '5', '--workers', '2', '--model', self.model,
+                                   '--checkpoint', self.checkpoint]), EXIT_ERROR)
+        errors = [json.loads(line) for line in stderr.getvalue().splitlines() if line.startswith('{')]
+        self.assertEqual(len(errors), 3)
+        self.assertTrue(all('error' in error for error in errors))
+    
+    def test_export(self):
+        """Test that both export formats load back as the same packed policy."""
+        policies = []
+        for fmt in ('npy', 'npz'):
+            code, result = self.run_cli('export', '--model', self.model, '--format', fmt)
+            self.assertEqual(code, EXIT_OK)
+            self.assertEqual(result['bytes'], os.path.getsize(result['output']))
+            policies.append(load_policy(result['output']))
+        np.testing.assert_array_equal(policies[0], policies[1])
+        self.assertEqual(int((policies[0] >= 0).sum()), result['known_states'])
+    
+    def test_simulate(self):
+        """Test headless mixed games, including repeated strategies and an unknown one."""
+        output = os.path.join(self.tmp_dir.name, "simulate.json")
+        code, _ = self.run_cli('--output', output, 'simulate', 'ev', 'ev', 'safe', f'ai:{self.model}', '--games', '10')
+        self.assertEqual(code, EXIT_OK)
+        with open(output) as f:
+            result = json.load(f)
+        self.assertEqual([seat['strategy'] for seat in result['seats']], ['ev', 'ev', 'safe', f'ai:{self.model}'])
+        self.assertEqual(sum(seat['wins'] for seat in result['seats']) + result['unfinished'], 10)
+        
+        self.assertEqual(self.run_cli('simulate', 'bogus')[0], EXIT_ERROR)
+
+if __name__ == '__main__':
+    unittest.main()
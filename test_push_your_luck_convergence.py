@@ -0,0 +1,34 @@
+import random
+import unittest
+from push_your_luck_convergence import evaluate, time_to_target, benchmark_update_modes
+from push_your_luck_solver import PushYourLuckSolver
+
+class TestConvergenceBenchmark(unittest.TestCase):
+    def test_evaluate_restores_training_state(self):
+        """Test that evaluation is repeatable and leaves exploration and the random state alone."""
+        solver = PushYourLuckSolver(exploration_rate=0.5)
+        random.seed(3)
+        before = random.getstate()
+        first = evaluate(solver, games=5, max_rounds=50)
+        self.assertEqual(random.getstate(), before)
+        self.assertEqual(solver.exploration_rate, 0.5)
+        self.assertEqual(evaluate(solver, games=5, max_rounds=50), first)
+    
+    def test_time_to_target(self):
+        """Test that an easy target is reached at the first check and an impossible one reports a miss."""
+        reached = time_to_target('q', target_rounds=1000, check_every=5, max_episodes=20, eval_games=2)
+        self.assertTrue(reached['reached'])
+        self.assertEqual(reached['episodes'], 5)
+        
+        missed = time_to_target('nstep', target_rounds=0, check_every=5, max_episodes=10, eval_games=2)
+        self.assertFalse(missed['reached'])
+        self.assertEqual(missed['episodes'], 10)
+        self.assertEqual(missed['mode'], 'nstep(3)')
+    
+    def test_benchmark_update_modes(self):
+        """Test that every mode and seed gets a result row."""
+        results = benchmark_update_modes(1000, seeds=[0, 1], check_every=5, eval_games=2)
+        self.assertEqual([r['mode'] for r in results], ['q', 'q', 'double', 'double', 'nstep(3)', 'nstep(3)'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from push_your_luck_fasteval import FastEvaluator, compare, main
+from push_your_luck_policyio import EXIT_ERROR
+from push_your_luck_policydiff import policy_visits
+from push_your_luck_index import mask_to_numbers
+from push_your_luck_solver import PushYourLuckSolver, ACTIONS, UNKNOWN_ACTION, num_states, unpack_state_index
+
+class TestFastEvaluator(unittest.TestCase):
+    def setUp(self):
+        """Build a solver that plays a fixed threshold strategy on a 5-number spinner up to 20 points."""
+        self.target_score = 20
+        self.spinner_size = 5
+        self.size = num_states(self.target_score, self.spinner_size)
+        self.solver = PushYourLuckSolver()
+        self.solver.main_spinner = list(range(1, self.spinner_size + 1))
+        self.solver.target_score = self.target_score
+        # Bank from 8 points, otherwise guess the side with more numbers left; every state is known
+        for index in range(self.size):
+            score, target_num, mask = unpack_state_index(index, self.spinner_size)
+            numbers = mask_to_numbers(mask)
+            bank = sum(self.solver.main_spinner) - sum(numbers)
+            higher = sum(num > target_num for num in numbers)
+            if bank >= 8:
+                action = 'bank'
+            else:
+                action = 'higher' if higher >= len(numbers) - higher else 'lower'
+            key = self.solver.get_mask_state_key(score, bank, target_num, mask)
+            self.solver.q_table[key] = {name: float(name == action) for name in ACTIONS}
+
+    def test_always_bank(self):
+        """Test that banking every target never busts and only banks the spinner's numbers."""
+        policy = np.full(self.size, ACTIONS.index('bank'), dtype=np.int8)
+        result = FastEvaluator(policy, self.target_score, self.spinner_size, batch_size=256).run(2000)
+
+        self.assertEqual(result['won'], 2000)
+        self.assertEqual(result['bank_histogram'][0], 0)
+        self.assertEqual(result['bank_histogram'][self.spinner_size + 1:].sum(), 0)
+        self.assertEqual(result['bank_histogram'].sum(), (result['rounds_histogram'] * np.arange(201)).sum())
+        self.assertEqual(result['rounds_histogram'][:self.target_score // self.spinner_size].sum(), 0)
+
+    def test_matches_exact_rounds(self):
+        """Test the average rounds to win against the exact expectation for the threshold strategy."""
+        policy = self.solver.compile_policy()
+        self.assertEqual(int((policy == UNKNOWN_ACTION).sum()), 0)
+        _, expected = policy_visits(policy, self.target_score, self.spinner_size)
+        result = FastEvaluator(policy, self.target_score, self.spinner_size, batch_size=1024).run(50000, seed=3)
+
+        rounds = np.arange(len(result['rounds_histogram']))
+        variance = (result['rounds_histogram'] * (rounds - result['avg_rounds']) ** 2).sum() / result['won']
+        self.assertLess(abs(result['avg_rounds'] - expected), 4 * (variance / result['won']) ** 0.5)
+        # Banks only ever happen from 8 points, or automatically on the last number
+        self.assertEqual(result['bank_histogram'][1:8].sum(), 0)
+
+    def test_game_count_and_seed(self):
+        """Test that exactly the requested games are played when they don't fill whole batches, reproducibly."""
+        policy = np.full(self.size, UNKNOWN_ACTION, dtype=np.int8)
+        evaluator = FastEvaluator(policy, self.target_score, self.spinner_size, batch_size=64)
+        first = evaluator.run(1000, seed=5, max_rounds=10)
+        second = evaluator.run(1000, seed=5, max_rounds=10)
+
+        self.assertEqual(first['won'] + first['abandoned'], 1000)
+        self.assertGreater(first['abandoned'], 0, "Random play should often need more than 10 rounds")
+        self.assertEqual(first['rounds_histogram'].sum(), first['won'])
+        np.testing.assert_array_equal(first['rounds_histogram'], second['rounds_histogram'])
+        np.testing.assert_array_equal(first['bank_histogram'], second['bank_histogram'])
+
+    def test_compare_and_main(self):
+        """Test the side-by-side report, from Python and from the command line, and a corrupt model."""
+        report = compare(self.solver, games=5000, baseline_games=200, batch_size=512)
+        self.assertEqual(report['play_game']['games'], 200)
+        self.assertGreater(report['speedup'], 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            model_file = os.path.join(directory, 'model.npy')
+            np.save(model_file, np.full(num_states(), ACTIONS.index('bank'), dtype=np.int8))
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                exit_code = main([model_file, '--games', '500', '--batch-size', '100'])
+            
+            # A corrupt pickle is reported as a JSON error, with or without the play_game baseline
+            corrupt_file = os.path.join(directory, 'corrupt.pkl')
+            with open(corrupt_file, 'wb') as f:
+                f.write(b"not a pickle")
+            for baseline_games in ('0', '10'):
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    self.assertEqual(main([corrupt_file, '--games', '10', '--baseline-games', baseline_games]),
+                                     EXIT_ERROR)
+                self.assertIn('error', json.loads(stderr.getvalue()))
+        self.assertEqual(exit_code, 0)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['won'], 500)
+        self.assertEqual(len(report['bank_histogram']), 92)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import random
+import tempfile
+import unittest
+from push_your_luck_hogwild import HogwildTrainer
+from push_your_luck_solver import PushYourLuckSolver, state_index, unpack_state_index, parse_state_key
+
+class TestHogwildTrainer(unittest.TestCase):
+    def setUp(self):
+        """Use a small spinner and target so the shared arrays stay tiny."""
+        self.trainer = HogwildTrainer(workers=2, target_score=20, spinner_size=5)
+    
+    def tearDown(self):
+        self.trainer.close()
+    
+    def test_state_index_round_trip(self):
+        """Test that packed state indices unpack to the same state."""
+        for score, target_num, mask in [(0, 1, 0b11110), (19, 5, 0b00001), (7, 3, 0b11011)]:
+            index = state_index(score, target_num, mask, 5)
+            self.assertEqual(unpack_state_index(index, 5), (score, target_num, mask))
+    
+    def test_train(self):
+        """Test that workers update the shared Q-values and the coordinator tracks progress."""
+        stats = self.trainer.train(400, chunk_size=50, verbose=False)
+        self.assertEqual(self.trainer.episodes_done, 400)
+        self.assertEqual(stats['win_rate'], 1.0)
+        self.assertGreater(stats['episodes_per_sec'], 0)
+        self.assertLess(self.trainer.exploration_rate, 1.0)
+        q, visited = self.trainer.arrays()
+        self.assertGreater(visited.sum(), 0)
+        self.assertTrue((q[visited == 0] == 0).all(), "Unvisited states should not be written")
+    
+    def test_to_solver(self):
+        """Test that shared Q-values convert into a playable PushYourLuckSolver."""
+        self.trainer.train(200, chunk_size=50, verbose=False)
+        solver = self.trainer.to_solver()
+        q, visited = self.trainer.arrays()
+        self.assertEqual(len(solver.q_table), int((visited > 0).sum()))
+        for state in solver.q_table:
+            score, bank, target_num, numbers = parse_state_key(state)
+            self.assertEqual(bank, 15 - sum(numbers), "Bank should equal the numbers already drawn")
+            self.assertNotIn(target_num, numbers)
+        solver.exploration_rate = 0
+        score, rounds = solver.play_game(verbose=False, max_rounds=100)
+        self.assertGreater(rounds, 0)
+    
+    def test_automatic_bank_wins_match_train(self):
+        """Test that wins from banking automatically are credited to 'bank', as PushYourLuckSolver.train does."""
+        # With two numbers every decision banks automatically, whatever was chosen
+        with HogwildTrainer(workers=1, exploration_rate=1, min_exploration_rate=1,
+                            target_score=3, spinner_size=2) as trainer:
+            trainer.train(200, chunk_size=50, verbose=False)
+            hogwild = trainer.to_solver()
+        random.seed(0)
+        solver = PushYourLuckSolver(exploration_rate=1, min_exploration_rate=1)
+        solver.main_spinner = [1, 2]
+        solver.target_score = 3
+        solver.train(num_episodes=200, verbose=False)
+        self.assertEqual({state: set(actions) for state, actions in hogwild.q_table.items()},
+                         {state: set(actions) for state, actions in solver.q_table.items() if actions})
+        self.assertTrue(all(set(actions) == {'bank'} for actions in hogwild.q_table.values()))
+    
+    def test_checkpoint(self):
+        """Test that a checkpoint restores Q-values and progress."""
+        self.trainer.train(100, chunk_size=50, verbose=False)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "checkpoint.npz")
+            self.trainer.save_checkpoint(filename)
+            with HogwildTrainer(workers=1, target_score=20, spinner_size=5) as restored:
+                restored.load_checkpoint(filename)
+                self.assertEqual(restored.episodes_done, 100)
+                self.assertTrue((restored.arrays()[0] == self.trainer.arrays()[0]).all())
+
+if __name__ == '__main__':
+    unittest.main()
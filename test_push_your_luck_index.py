@@ -0,0 +1,106 @@
+import random
+import unittest
+from push_your_luck_index import RemainingIndex, numbers_to_mask, mask_to_numbers
+from push_your_luck_mixed import ExpectedValuePlayer, ProbabilityPlayer
+from push_your_luck_solver import PushYourLuckSolver
+
+def scan_probability_guess(target_num, available_numbers):
+    """ProbabilityPlayer.get_guess as it was before the index, scanning the list."""
+    higher_prob = sum(1 for num in available_numbers if num > target_num) / len(available_numbers)
+    lower_prob = sum(1 for num in available_numbers if num < target_num) / len(available_numbers)
+    if higher_prob > 0.5:
+        return 'higher'
+    if lower_prob > 0.5:
+        return 'lower'
+    return 'bank'
+
+def scan_ev_guess(player, target_num, available_numbers):
+    """ExpectedValuePlayer.get_guess as it was before the index, scanning the list."""
+    higher = [num for num in available_numbers if num > target_num]
+    lower = [num for num in available_numbers if num < target_num]
+    if not higher and not lower:
+        return 'bank'
+    total = len(available_numbers)
+    weighted_higher = len(higher) / total * (sum(higher) / len(higher)) if higher else float('-inf')
+    weighted_lower = len(lower) / total * (sum(lower) / len(lower)) if lower else float('-inf')
+    if higher and lower:
+        if weighted_higher < player.bank * player.bank_threshold and \
+           weighted_lower < player.bank * player.bank_threshold:
+            return 'bank'
+        if abs(weighted_higher - weighted_lower) / max(weighted_higher, weighted_lower) < player.payoff_threshold:
+            return 'bank'
+        if player.bank > max(weighted_higher, weighted_lower) * 1.5:
+            return 'bank'
+    if not higher:
+        return 'lower'
+    if not lower:
+        return 'higher'
+    return 'higher' if weighted_higher > weighted_lower else 'lower'
+
+class TestRemainingIndex(unittest.TestCase):
+    def test_queries_match_scan(self):
+        """Test counts, sums and means against a scan of the remaining numbers while numbers are drawn."""
+        rng = random.Random(0)
+        numbers = list(range(1, 14))
+        index = RemainingIndex(numbers)
+        while numbers:
+            for target in range(0, 15):
+                above = [n for n in numbers if n > target]
+                below = [n for n in numbers if n < target]
+                self.assertEqual(index.count_above(target), len(above))
+                self.assertEqual(index.count_below(target), len(below))
+                self.assertEqual(index.sum_above(target), sum(above))
+                self.assertEqual(index.sum_below(target), sum(below))
+                if above:
+                    self.assertAlmostEqual(index.mean_above(target), sum(above) / len(above))
+                if below:
+                    self.assertAlmostEqual(index.mean_below(target), sum(below) / len(below))
+            self.assertEqual(len(index), len(numbers))
+            self.assertEqual(index.mask, numbers_to_mask(numbers))
+            drawn = rng.choice(numbers)
+            numbers.remove(drawn)
+            index.remove(drawn)
+            self.assertNotIn(drawn, index)
+        self.assertEqual(index.mask, 0)
+    
+    def test_duplicates(self):
+        """Test that a number stays in the mask until its last copy is removed."""
+        index = RemainingIndex([3, 3, 8])
+        self.assertEqual(index.count_below(5), 2)
+        self.assertEqual(index.sum_below(5), 6)
+        index.remove(3)
+        self.assertIn(3, index)
+        self.assertEqual(mask_to_numbers(index.mask), [3, 8])
+        index.remove(3)
+        self.assertEqual(mask_to_numbers(index.mask), [8])
+    
+    def test_remove_missing_number(self):
+        """Test that removing a number that is not remaining raises ValueError."""
+        index = RemainingIndex([1, 2])
+        with self.assertRaises(ValueError):
+            index.remove(5)
+        self.assertEqual(len(index), 2)
+    
+    def test_players_match_list_scan(self):
+        """Test that bots using the index decide as the list-scanning versions they replaced did."""
+        rng = random.Random(1)
+        prob = ProbabilityPlayer("Prob")
+        ev = ExpectedValuePlayer("EV")
+        for _ in range(2000):
+            numbers = sorted(rng.sample(range(1, 14), rng.randint(1, 12)))
+            target = rng.choice([n for n in range(1, 14) if n not in numbers])
+            ev.bank = rng.randint(1, 91)
+            for index in (RemainingIndex(numbers), None):
+                self.assertEqual(prob.get_guess(target, numbers, index), scan_probability_guess(target, numbers))
+                self.assertEqual(ev.get_guess(target, numbers, index), scan_ev_guess(ev, target, numbers))
+    
+    def test_mask_state_key(self):
+        """Test that the solver's mask-based state key matches get_state_key."""
+        solver = PushYourLuckSolver()
+        numbers = [1, 4, 6, 13]
+        self.assertEqual(solver.get_mask_state_key(12, 30, 7, numbers_to_mask(numbers)),
+                         solver.get_state_key(12, 30, 7, numbers))
+        self.assertEqual(solver.get_mask_state_key(0, 91, 5, 0), solver.get_state_key(0, 91, 5, []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import random
+import tempfile
+import unittest
+from push_your_luck_log import GameLogWriter, read_transitions
+from push_your_luck_index import numbers_to_mask, mask_to_numbers
+from push_your_luck_solver import PushYourLuckSolver
+from push_your_luck_mixed import MixedPushYourLuckGame, SafePlayer, ProbabilityPlayer
+
+class TestGameLog(unittest.TestCase):
+    def setUp(self):
+        """Create a scratch directory for log files."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmp_dir.name, "games.jsonl")
+    
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+    
+    def test_mask_round_trip(self):
+        """Test that numbers survive packing into a bitmask."""
+        numbers = [1, 2, 4, 9, 13]
+        self.assertEqual(numbers_to_mask(numbers), 0b1000100001011)
+        self.assertEqual(mask_to_numbers(numbers_to_mask(numbers)), numbers)
+        self.assertEqual(mask_to_numbers(0), [])
+    
+    def test_write_and_read(self):
+        """Test that buffered transitions are written on close and read back in order."""
+        log = GameLogWriter(self.log_path, buffer_size=10)
+        log.record(0, 5, 5, [1, 2, 3, 4, 6], 'higher', 6)
+        log.record(0, 11, 6, [1, 2, 3, 4], 'bank')
+        self.assertEqual(os.path.getsize(self.log_path), 0, "Transitions should stay buffered")
+        log.close()
+        
+        transitions = list(read_transitions(self.log_path))
+        self.assertEqual(transitions, [
+            (0, 5, 5, numbers_to_mask([1, 2, 3, 4, 6]), 'higher', 6),
+            (0, 11, 6, numbers_to_mask([1, 2, 3, 4]), 'bank', 0),
+        ])
+    
+    def test_log_appends(self):
+        """Test that reopening a log appends rather than truncates."""
+        for _ in range(2):
+            with GameLogWriter(self.log_path) as log:
+                log.record(0, 3, 3, [1, 2], 'lower', 1)
+        self.assertEqual(len(list(read_transitions(self.log_path))), 2)
+    
+    def test_solver_games_are_logged(self):
+        """Test that play_game records one transition per decision."""
+        solver = PushYourLuckSolver()
+        solver.exploration_rate = 0
+        with GameLogWriter(self.log_path) as log:
+            score, rounds = solver.play_game(verbose=False, game_log=log)
+        transitions = list(read_transitions(self.log_path))
+        self.assertGreaterEqual(len(transitions), rounds)
+        self.assertEqual(sum(bank for _, bank, _, _, action, _ in transitions if action == 'bank'), score)
+    
+    def test_mixed_games_are_logged(self):
+        """Test that every bot move in the mixed game is recorded."""
+        with GameLogWriter(self.log_path) as log:
+            game = MixedPushYourLuckGame(game_log=log)
+            game.add_player(SafePlayer("Safe Test"))
+            game.add_player(ProbabilityPlayer("Prob Test"))
+            game.play_round()
+        transitions = list(read_transitions(self.log_path))
+        self.assertGreaterEqual(len(transitions), 2)
+        self.assertEqual(transitions[0][4], 'bank', "SafePlayer banks first")
+    
+    def test_offline_training_matches_online_updates(self):
+        """Test that offline training applies the same updates as train()."""
+        random.seed(7)
+        online = PushYourLuckSolver()
+        with GameLogWriter(self.log_path) as log:
+            online.train(num_episodes=3, verbose=False, game_log=log)
+        
+        offline = PushYourLuckSolver()
+        offline.train_offline(self.log_path, verbose=False)
+        self.assertEqual(set(online.q_table), set(offline.q_table))
+        for state, actions in online.q_table.items():
+            for action, value in actions.items():
+                self.assertAlmostEqual(offline.q_table[state][action], value)
+    
+    def test_automatic_bank_wins_match_offline(self):
+        """Test that a win from banking automatically is credited to 'bank' both online and offline."""
+        random.seed(3)
+        online = PushYourLuckSolver()
+        online.main_spinner = [1, 2]  # Every round ends by banking automatically after the first decision
+        online.target_score = 3
+        online.exploration_rate = online.min_exploration_rate = 1
+        with GameLogWriter(self.log_path) as log:
+            online.train(num_episodes=20, verbose=False, game_log=log)
+
+        offline = PushYourLuckSolver()
+        offline.target_score = 3
+        offline.train_offline(self.log_path, verbose=False)
+        self.assertEqual(set(online.q_table), set(offline.q_table))
+        for state, actions in online.q_table.items():
+            for action, value in actions.items():
+                self.assertAlmostEqual(offline.q_table[state][action], value)
+    
+    def test_mixed_last_number_is_logged(self):
+        """Test that banking automatically on an empty spinner is recorded in the mixed game."""
+        with GameLogWriter(self.log_path) as log:
+            game = MixedPushYourLuckGame(game_log=log, verbose=False)
+            game.add_player(ProbabilityPlayer("Prob Test"))
+            game.start_new_round()
+            game.round_spinner = []
+            game.players[0].bank = 40
+            game.players[0].is_active = True
+            # Skip start_new_round so the empty spinner is kept
+            game.start_new_round = lambda: None
+            game.play_round()
+        self.assertEqual(list(read_transitions(self.log_path)), [(0, 40, game.target_num, 0, 'bank', 0)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from push_your_luck_policyio import EXIT_ERROR, EXIT_GATE_FAILED
+from push_your_luck_policydiff import policy_visits, diff_policies, main
+from push_your_luck_solver import PushYourLuckSolver, ACTIONS, UNKNOWN_ACTION, num_states, state_index
+
+class TestPolicyDiff(unittest.TestCase):
+    def setUp(self):
+        """Use a 5-number spinner and a target of 20 so policies stay small."""
+        self.target_score = 20
+        self.spinner_size = 5
+        self.size = num_states(self.target_score, self.spinner_size)
+    
+    def small_solver(self) -> PushYourLuckSolver:
+        solver = PushYourLuckSolver()
+        solver.main_spinner = list(range(1, self.spinner_size + 1))
+        solver.target_score = self.target_score
+        return solver
+    
+    def test_always_bank_rounds(self):
+        """Test that banking every target takes the expected number of draws to reach the target."""
+        policy = np.full(self.size, ACTIONS.index('bank'), dtype=np.int8)
+        _, rounds = policy_visits(policy, self.target_score, self.spinner_size)
+        
+        expected = [0.0] * (self.target_score + self.spinner_size)
+        for score in range(self.target_score - 1, -1, -1):
+            expected[score] = 1 + sum(expected[score + t] for t in range(1, self.spinner_size + 1)) / self.spinner_size
+        self.assertAlmostEqual(rounds, expected[0])
+    
+    def test_matches_simulation(self):
+        """Test exact rounds to win against greedy play of a partly trained model."""
+        random.seed(0)
+        solver = self.small_solver()
+        solver.train(num_episodes=200, verbose=False)
+        visits, rounds = policy_visits(solver.compile_policy(), self.target_score, self.spinner_size)
+        
+        solver.exploration_rate = 0
+        games = 4000
+        played = [solver.play_game(verbose=False)[1] for _ in range(games)]
+        mean = sum(played) / games
+        std_error = (sum((r - mean) ** 2 for r in played) / (games - 1) / games) ** 0.5
+        self.assertLess(abs(rounds - mean), 4 * std_error)
+        self.assertGreater(visits.sum(), rounds, "Every round has at least one decision")
+    
+    def test_diff_weights_changes_by_new_policy_visits(self):
+        """Test that only changed states are reported, weighted by their visits under the new policy."""
+        old = np.full(self.size, ACTIONS.index('bank'), dtype=np.int8)
+        new = old.copy()
+        start = state_index(0, 3, 0b11011, self.spinner_size)
+        new[start] = ACTIONS.index('higher')
+        unreachable = state_index(19, 1, 0b00000, self.spinner_size)
+        new[unreachable] = UNKNOWN_ACTION
+        
+        report = diff_policies(old, new, self.target_score, self.spinner_size)
+        visits, _ = policy_visits(new, self.target_score, self.spinner_size)
+        self.assertEqual(report['changed_states'], 2)
+        self.assertEqual(report['reachable_changed_states'], 1)
+        self.assertAlmostEqual(report['changed_visits_per_game'], visits[start])
+        # Rounds at score 0 start there 1 time in 5, and half of those bust back to score 0
+        self.assertAlmostEqual(visits[start], (1 / 5) / (1 - (1 / 5) * (2 / 4)))
+        top = report['top_changes'][0]
+        self.assertEqual((top['score'], top['target'], top['remaining'], top['bank']), (0, 3, [1, 2, 4, 5], 3))
+        self.assertEqual((top['old_action'], top['new_action']), ('bank', 'higher'))
+        self.assertEqual(diff_policies(old, old, self.target_score, self.spinner_size)['expected_rounds_change'], 0)
+    
+    def test_gate(self):
+        """Test the CI gate on full-size exported policies, and missing or corrupt inputs."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bank_file = os.path.join(tmp_dir, "bank.npy")
+            random_file = os.path.join(tmp_dir, "random.npy")
+            np.save(bank_file, np.full(num_states(), ACTIONS.index('bank'), dtype=np.int8))
+            np.save(random_file, np.full(num_states(), UNKNOWN_ACTION, dtype=np.int8))
+            
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                code = main([bank_file, random_file, '--max-rounds-increase', '0'])
+            report = json.loads(stdout.getvalue())
+            self.assertEqual(code, EXIT_GATE_FAILED)
+            self.assertGreater(report['expected_rounds_change'], 0, "Random play should be slower than banking")
+            
+            corrupt_file = os.path.join(tmp_dir, "corrupt.pkl")
+            with open(corrupt_file, 'wb') as f:
+                f.write(b"not a pickle")
+            for bad_file in (os.path.join(tmp_dir, "missing.pkl"), corrupt_file):
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    self.assertEqual(main([bank_file, bad_file]), EXIT_ERROR)
+                self.assertIn('error', json.loads(stderr.getvalue()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from push_your_luck_index import numbers_to_mask
+from push_your_luck_policyio import CLIError, load_policy
+from push_your_luck_solver import PushYourLuckSolver, ACTIONS, UNKNOWN_ACTION, state_index
+from push_your_luck_service import PolicyServer, PolicyClient, RemoteAIPlayer, load_test, ERROR_REPLY
+
+class TestPolicyService(unittest.TestCase):
+    def setUp(self):
+        """Serve a small hand-made policy on a scratch socket."""
+        self.solver = PushYourLuckSolver()
+        self.higher_state = self.solver.get_state_key(0, 1, 1, list(range(2, 14)))
+        self.solver.q_table[self.higher_state] = {'higher': 10, 'lower': -10, 'bank': 5}
+        self.bank_state = self.solver.get_state_key(40, 85, 3, [1, 5])
+        self.solver.q_table[self.bank_state] = {'higher': 1, 'lower': 1, 'bank': 5}
+        
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp_dir.name, "policy.sock")
+        self.server = PolicyServer(self.solver.compile_policy(), self.socket_path)
+        self.server.start()
+    
+    def tearDown(self):
+        self.server.stop()
+        self.tmp_dir.cleanup()
+    
+    def test_compile_policy(self):
+        """Test that the packed policy holds each state's greedy action."""
+        policy = self.server.policy
+        self.assertEqual(ACTIONS[policy[state_index(0, 1, numbers_to_mask(range(2, 14)))]], 'higher')
+        self.assertEqual(ACTIONS[policy[state_index(40, 3, numbers_to_mask([1, 5]))]], 'bank')
+        self.assertEqual((policy != UNKNOWN_ACTION).sum(), 2)
+    
+    def test_client(self):
+        """Test that the server answers from the policy."""
+        client = PolicyClient(self.socket_path)
+        try:
+            self.assertEqual(client.get_action(0, 1, numbers_to_mask(range(2, 14))), 'higher')
+            self.assertEqual(client.get_action(40, 3, numbers_to_mask([1, 5])), 'bank')
+            # Unknown and out-of-range states still get a legal action
+            self.assertIn(client.get_action(5, 7, numbers_to_mask([1, 2])), ACTIONS)
+            self.assertIn(client.get_action(150, 7, numbers_to_mask([1, 2])), ACTIONS)
+        finally:
+            client.close()
+    
+    def test_bad_requests(self):
+        """Test that invalid masks and malformed lines don't stop the server answering."""
+        client = PolicyClient(self.socket_path)
+        try:
+            # Bits beyond the spinner and the target's own bit are out of range
+            self.assertIn(client.get_action(0, 10, 1 << 30), ACTIONS)
+            self.assertIn(client.get_action(0, 10, -1), ACTIONS)
+            self.assertIn(client.get_action(0, 10, 1 << 9), ACTIONS)
+            for line in (b"0 10\n", b"0 ten 5\n", b"1 2 3 4\n"):
+                client.sock.sendall(line)
+                self.assertEqual(client.reader.readline().decode().strip(), ERROR_REPLY)
+            self.assertEqual(client.get_action(0, 1, numbers_to_mask(range(2, 14))), 'higher')
+        finally:
+            client.close()
+        
+        # A batch that fails answers its own requests with an error and leaves the batcher running
+        policy = self.server.policy
+        self.server.policy = None
+        pending = self.server.submit(0, 1, numbers_to_mask(range(2, 14)))
+        pending.event.wait(5)
+        self.assertEqual(pending.action, ERROR_REPLY)
+        self.server.policy = policy
+        pending = self.server.submit(0, 1, numbers_to_mask(range(2, 14)))
+        pending.event.wait(5)
+        self.assertEqual(pending.action, 'higher')
+    
+    def test_load_policy(self):
+        """Test that a pickled model compiles to the served policy, and a missing or corrupt one is refused."""
+        model_file = os.path.join(self.tmp_dir.name, "model.pkl")
+        self.solver.save_model(model_file)
+        self.assertTrue((load_policy(model_file) == self.server.policy).all())
+        
+        corrupt_file = os.path.join(self.tmp_dir.name, "corrupt.pkl")
+        with open(corrupt_file, 'wb') as f:
+            f.write(b"not a pickle")
+        for bad_file in (os.path.join(self.tmp_dir.name, "typo.pkl"), corrupt_file):
+            with self.assertRaises(CLIError):
+                load_policy(bad_file)
+    
+    def test_remote_ai_player(self):
+        """Test that RemoteAIPlayer decides like the local AIPlayer would."""
+        player = RemoteAIPlayer("Remote AI", self.socket_path)
+        player.score = 40
+        player.bank = 85
+        self.assertEqual(player.get_guess(3, [1, 5]), 'bank')
+        player.client.close()
+    
+    def test_concurrent_requests_are_batched(self):
+        """Test that concurrent clients are served and their requests coalesced."""
+        stats = load_test(self.socket_path, clients=4, requests_per_client=200)
+        self.assertEqual(stats['requests'], 800)
+        self.assertGreater(stats['throughput'], 0)
+        self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+        self.assertEqual(self.server.batched_requests, 800)
+        self.assertLess(self.server.batches, 800)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from push_your_luck_solver import PushYourLuckSolver
 import random
@@ -161,6 +163,94 @@ class TestPushYourLuckSolver(unittest.TestCase):
         self.solver.update_q_value(state, 'higher', -50, next_state)
         self.assertLess(self.solver.q_table[state]['higher'], 0, "Q-value should be negative after negative reward")
     
+    def test_lookups_do_not_insert(self):
+        """Test that choosing actions and reading next states leave the Q-table unchanged."""
+        self.solver.get_action("0_5_3_1,2,4,5")
+        self.solver.update_q_value("0_5_3_1,2,4,5", 'bank', -1, "5_0_0_")
+        self.assertNotIn("5_0_0_", self.solver.q_table)
+        self.assertEqual(len(self.solver.q_table), 1)
+    
+    def test_bounded_q_table_lru(self):
+        """Test that the least-recently-updated state is evicted at the cap."""
+        solver = PushYourLuckSolver(max_entries=2, eviction_policy='lru')
+        solver.update_q_value("a", 'bank', 1, "0_0_0_")
+        solver.update_q_value("b", 'bank', 1, "0_0_0_")
+        solver.update_q_value("a", 'bank', 1, "0_0_0_")
+        solver.update_q_value("c", 'bank', 1, "0_0_0_")
+        self.assertEqual(set(solver.q_table), {"a", "c"})
+    
+    def test_bounded_q_table_visits(self):
+        """Test that the least-visited state is evicted at the cap."""
+        solver = PushYourLuckSolver(max_entries=2, eviction_policy='visits')
+        for _ in range(3):
+            solver.update_q_value("a", 'bank', 1, "0_0_0_")
+        solver.update_q_value("b", 'bank', 1, "0_0_0_")
+        solver.update_q_value("c", 'bank', 1, "0_0_0_")
+        self.assertEqual(set(solver.q_table), {"a", "c"})
+    
+    def test_bounded_training(self):
+        """Test that training never grows the Q-table past the cap."""
+        solver = PushYourLuckSolver(max_entries=50)
+        solver.train(num_episodes=5, verbose=False)
+        self.assertLessEqual(len(solver.q_table), 50)
+    
+    def test_prune(self):
+        """Test that pruning drops empty and terminal placeholder entries only."""
+        self.solver.q_table["0_5_3_1,2,4,5"]['higher'] = 1.0
+        self.solver.q_table["5_0_0_"]['bank'] = 0.0
+        self.solver.q_table["0_8_4_1,2,5"]
+        before = self.solver.memory_stats()
+        self.assertEqual(before['states'], 3)
+        self.assertEqual(before['empty_states'], 1)
+        self.assertEqual(before['terminal_states'], 1)
+        
+        removed = self.solver.prune(verbose=False)
+        self.assertEqual(removed, 2)
+        self.assertEqual(list(self.solver.q_table), ["0_5_3_1,2,4,5"])
+        self.assertLess(self.solver.memory_stats()['approx_bytes'], before['approx_bytes'])
+    
+    def test_unknown_update_mode(self):
+        """Test that an unknown update mode is rejected."""
+        with self.assertRaises(ValueError):
+            PushYourLuckSolver(update_mode='sarsa')
+    
+    def test_double_q_updates(self):
+        """Test that double Q-learning updates one table and acts on the mean of both."""
+        solver = PushYourLuckSolver(update_mode='double')
+        solver.q_table["0_5_3_1,2,4,5"]['higher'] = 4.0  # e.g. from a loaded model
+        solver.update_q_value("0_5_3_1,2,4,5", 'higher', 10, "0_0_0_")
+        values = sorted(table["0_5_3_1,2,4,5"]['higher'] for table in solver.double_tables)
+        self.assertEqual(values[0], 4.0, "The other table should keep the seeded value")
+        self.assertAlmostEqual(values[1], 4.0 + 0.1 * (10 - 4.0))
+        self.assertAlmostEqual(solver.q_table["0_5_3_1,2,4,5"]['higher'], sum(values) / 2)
+        self.assertNotIn("0_0_0_", solver.q_table)
+    
+    def test_n_step_returns(self):
+        """Test that n-step updates use discounted rewards and bootstrap from the state n steps on."""
+        solver = PushYourLuckSolver(update_mode='nstep', n_steps=2, learning_rate=1.0, discount_factor=0.5)
+        solver.q_table["c"]['bank'] = 8.0
+        solver._learn("a", 'higher', 2, "b")
+        solver._learn("b", 'higher', 2, "c")
+        self.assertNotIn("a", solver.q_table, "Nothing is learned until n steps are pending")
+        solver._learn("c", 'bank', -1, "5_0_0_")
+        self.assertAlmostEqual(solver.q_table["a"]['higher'], 2 + 0.5 * 2 + 0.25 * 8.0)
+        
+        # The win reward reaches every pending decision
+        solver._learn_win("c", 'bank', "5_0_0_")
+        self.assertAlmostEqual(solver.q_table["c"]['bank'], -1 + 100)
+        self.assertAlmostEqual(solver.q_table["b"]['higher'], 2 + 0.5 * 99)
+        self.assertEqual(len(solver.pending_steps), 0)
+    
+    def test_training_update_modes(self):
+        """Test that every update mode trains to completed games."""
+        for mode in ('q', 'double', 'nstep'):
+            with self.subTest(mode=mode):
+                random.seed(0)
+                solver = PushYourLuckSolver(update_mode=mode)
+                solver.train(num_episodes=5, verbose=False)
+                self.assertGreater(len(solver.q_table), 0)
+                self.assertEqual(len(solver.pending_steps), 0)
+    
     def test_model_saving_loading(self):
         """Test that the model can be saved and loaded correctly."""
         # Train the model a bit
@@ -168,9 +258,11 @@ class TestPushYourLuckSolver(unittest.TestCase):
         self.solver.q_table[state] = {'higher': 10, 'lower': 5, 'bank': 8}
         
         # Save and load
-        self.solver.save_model("test_model.pkl")
-        new_solver = PushYourLuckSolver()
-        new_solver.load_model("test_model.pkl")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "test_model.pkl")
+            self.solver.save_model(filename)
+            new_solver = PushYourLuckSolver()
+            new_solver.load_model(filename)
         
         # Check if Q-values are preserved
         self.assertEqual(self.solver.q_table[state], new_solver.q_table[state],
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from push_your_luck_sweep import SweepRunner, expand_spec, cache_key, rank_results, format_table, training_sources
+
+class TestSweep(unittest.TestCase):
+    def test_grid_spec(self):
+        """Test that a grid spec expands to the cartesian product."""
+        configs = expand_spec({'search': 'grid',
+                               'params': {'learning_rate': [0.05, 0.1], 'discount_factor': [0.9, 0.95, 0.99]}})
+        self.assertEqual(len(configs), 6)
+        self.assertIn({'learning_rate': 0.1, 'discount_factor': 0.99}, configs)
+    
+    def test_random_spec(self):
+        """Test that a random spec samples inside its ranges and is reproducible."""
+        spec = {'search': 'random', 'samples': 5, 'seed': 3,
+                'params': {'learning_rate': {'low': 0.01, 'high': 0.5, 'log': True},
+                           'discount_factor': [0.9, 0.95]}}
+        configs = expand_spec(spec)
+        self.assertEqual(len(configs), 5)
+        self.assertEqual(configs, expand_spec(spec))
+        for config in configs:
+            self.assertGreaterEqual(config['learning_rate'], 0.01)
+            self.assertLessEqual(config['learning_rate'], 0.5)
+            self.assertIn(config['discount_factor'], [0.9, 0.95])
+    
+    def test_training_sources(self):
+        """Test that the cache version covers the modules training imports, such as the remaining-number index."""
+        names = [os.path.basename(filename) for filename in training_sources()]
+        self.assertIn('push_your_luck_solver.py', names)
+        self.assertIn('push_your_luck_index.py', names)
+        self.assertNotIn('push_your_luck_sweep.py', names)
+    
+    def test_unknown_parameter(self):
+        """Test that a typo in the spec is rejected."""
+        with self.assertRaises(ValueError):
+            expand_spec({'search': 'grid', 'params': {'learning_rat': [0.1]}})
+    
+    def test_cache_key(self):
+        """Test that the cache key depends on config, seed and code version."""
+        key = cache_key({'learning_rate': 0.1}, 0, 100, 10, 'v1')
+        self.assertEqual(key, cache_key({'learning_rate': 0.1}, 0, 100, 10, 'v1'))
+        self.assertNotEqual(key, cache_key({'learning_rate': 0.1}, 1, 100, 10, 'v1'))
+        self.assertNotEqual(key, cache_key({'learning_rate': 0.2}, 0, 100, 10, 'v1'))
+        self.assertNotEqual(key, cache_key({'learning_rate': 0.1}, 0, 100, 10, 'v2'))
+    
+    def test_run_uses_cache(self):
+        """Test that a rerun skips points that are already cached."""
+        configs = [{'learning_rate': 0.1}, {'learning_rate': 0.5}]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            runner = SweepRunner(episodes=20, eval_games=5, workers=1, cache_dir=cache_dir)
+            first = runner.run(configs, verbose=False)
+            self.assertEqual(len(first), 2)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            
+            # Every point is cached now, so no worker pool is needed
+            second = runner.run(configs, verbose=False)
+            self.assertEqual(sorted(r['avg_rounds'] for r in first),
+                             sorted(r['avg_rounds'] for r in second))
+    
+    def test_rank_results(self):
+        """Test that results are averaged over seeds and ranked by rounds to win."""
+        results = [
+            {'config': {'learning_rate': 0.1}, 'seed': 0, 'avg_rounds': 12.0, 'win_rate': 1.0},
+            {'config': {'learning_rate': 0.1}, 'seed': 1, 'avg_rounds': 14.0, 'win_rate': 1.0},
+            {'config': {'learning_rate': 0.5}, 'seed': 0, 'avg_rounds': 11.0, 'win_rate': 1.0},
+        ]
+        ranked = rank_results(results)
+        self.assertEqual(ranked[0]['config'], {'learning_rate': 0.5})
+        self.assertEqual(ranked[1]['avg_rounds'], 13.0)
+        self.assertEqual(ranked[1]['seeds'], 2)
+        self.assertIn('learning_rate', format_table(ranked))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from push_your_luck_mixed import SafePlayer, ExpectedValuePlayer, AIPlayer, MixedPushYourLuckGame
+from push_your_luck_solver import PushYourLuckSolver
+from push_your_luck_tournament import make_player, play_match, schedule, EloRatings, run_tournament
+
+class TestTournament(unittest.TestCase):
+    def test_make_player(self):
+        """Test that strategy specs build the right computer players."""
+        self.assertIsInstance(make_player('safe'), SafePlayer)
+        player = make_player('ev:0.5:0.2')
+        self.assertIsInstance(player, ExpectedValuePlayer)
+        self.assertEqual(player.bank_threshold, 0.5)
+        self.assertEqual(player.payoff_threshold, 0.2)
+        with self.assertRaises(ValueError):
+            make_player('reckless')
+    
+    def test_make_ai_player(self):
+        """Test that AI specs load their model, and a missing or corrupt model is an error rather than random play."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_file = os.path.join(tmp_dir, "model.pkl")
+            solver = PushYourLuckSolver()
+            solver.q_table[solver.get_state_key(0, 1, 1, list(range(2, 14)))] = {'higher': 1.0}
+            solver.save_model(model_file)
+            player = make_player(f'ai:{model_file}')
+            self.assertIsInstance(player, AIPlayer)
+            self.assertEqual(dict(player.solver.q_table), dict(solver.q_table))
+            
+            corrupt_file = os.path.join(tmp_dir, "corrupt.pkl")
+            with open(corrupt_file, 'wb') as f:
+                f.write(b"not a pickle")
+            for bad_file in (os.path.join(tmp_dir, "missing.pkl"), corrupt_file):
+                with self.assertRaises(ValueError):
+                    make_player(f'ai:{bad_file}')
+                with self.assertRaises(ValueError):
+                    run_tournament(['safe', f'ai:{bad_file}'], table_size=2, games_per_table=2,
+                                   workers=1, verbose=False)
+    
+    def test_schedule(self):
+        """Test that every combination is scheduled the requested number of times, rotating the seats."""
+        matches = schedule(['safe', 'probability', 'ev'], 2, 4)
+        self.assertEqual(len(matches), 12)
+        self.assertEqual({frozenset(seats) for seats, _ in matches},
+                         {frozenset(('safe', 'probability')), frozenset(('safe', 'ev')),
+                          frozenset(('probability', 'ev'))})
+        for strategy in ('safe', 'probability', 'ev'):
+            for seat in range(2):
+                self.assertEqual(sum(seats[seat] == strategy for seats, _ in matches), 4)
+    
+    def test_identical_strategies_rate_equally(self):
+        """Test that two strategies making the same decisions end up with about the same rating."""
+        ratings = run_tournament(['ev', 'ev:0.8:0.1'], table_size=2, games_per_table=20,
+                                 workers=1, verbose=False)
+        self.assertEqual(ratings.wins['ev'], ratings.wins['ev:0.8:0.1'])
+        self.assertLess(abs(ratings.ratings['ev'] - ratings.ratings['ev:0.8:0.1']), 40)
+    
+    def test_play_match(self):
+        """Test that a headless match is reproducible and produces a winner."""
+        result = play_match(('safe', 'probability', 'ev'), seed=5)
+        self.assertEqual(result, play_match(('safe', 'probability', 'ev'), seed=5))
+        self.assertIn(result['winner'], result['seats'])
+        self.assertGreaterEqual(max(result['scores']), 100)
+    
+    def test_last_number_banks(self):
+        """Test that players still active when the spinner runs out bank automatically."""
+        game = MixedPushYourLuckGame(verbose=False)
+        game.add_player(make_player('probability'))
+        game.start_new_round()
+        game.round_spinner = []
+        game.players[0].bank = 40
+        game.players[0].is_active = True
+        # Skip start_new_round so the empty spinner is kept
+        game.start_new_round = lambda: None
+        game.play_round()
+        self.assertEqual(game.players[0].score, 40)
+    
+    def test_elo_updates(self):
+        """Test that the winner gains rating and ratings are zero-sum."""
+        ratings = EloRatings()
+        ratings.update({'seats': ['a', 'b', 'c'], 'scores': [105, 60, 60], 'winner': 'a'})
+        self.assertGreater(ratings.ratings['a'], 1500)
+        self.assertAlmostEqual(ratings.ratings['b'], ratings.ratings['c'])
+        self.assertAlmostEqual(sum(ratings.ratings.values()), 4500)
+        self.assertEqual(ratings.leaderboard()[0]['strategy'], 'a')
+    
+    def test_run_tournament(self):
+        """Test a small tournament across a process pool."""
+        ratings = run_tournament(['safe', 'probability', 'ev'], table_size=2, games_per_table=4,
+                                 workers=2, verbose=False)
+        board = ratings.leaderboard()
+        self.assertEqual(len(board), 3)
+        self.assertEqual(sum(row['games'] for row in board), 24)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import random
+import unittest
+from push_your_luck_index import RemainingIndex
+from push_your_luck_mixed import (
+    SafePlayer, ProbabilityPlayer, ExpectedValuePlayer, AIPlayer, MixedPushYourLuckGame
+)
+from push_your_luck_solver import PushYourLuckSolver, HIGHER, LOWER, BANK
+from push_your_luck_vectorized import VectorizedMixedGame
+
+class TestVectorizedMixedGame(unittest.TestCase):
+    def test_matches_object_game(self):
+        """Test that the same seed gives the same scores and winner as MixedPushYourLuckGame."""
+        seats = [(SafePlayer, 3), (ProbabilityPlayer, 4), (ExpectedValuePlayer, 5)]
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                random.seed(seed)
+                game = MixedPushYourLuckGame(verbose=False)
+                for player_class, count in seats:
+                    for i in range(count):
+                        game.add_player(player_class(f"{player_class.__name__} {i}"))
+                winner = game.play_game()
+                
+                random.seed(seed)
+                vectorized = VectorizedMixedGame()
+                for player_class, count in seats:
+                    vectorized.add_players(player_class(player_class.__name__), count)
+                seat = vectorized.play_game()
+                
+                self.assertEqual(vectorized.score.tolist(), [p.score for p in game.players])
+                self.assertIs(game.players[seat], winner)
+    
+    def test_ai_seats_match_object_game(self):
+        """Test that AI seats, with and without known states, play the same game as MixedPushYourLuckGame."""
+        random.seed(0)
+        trained = PushYourLuckSolver()
+        trained.train(num_episodes=50, verbose=False)
+        seats = [(PushYourLuckSolver(), 4), (trained, 3)]  # An empty model guesses at random everywhere
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                random.seed(seed)
+                game = MixedPushYourLuckGame(verbose=False)
+                game.add_player(ExpectedValuePlayer("EV"))
+                for solver, count in seats:
+                    for i in range(count):
+                        game.add_player(AIPlayer(f"AI {i}", solver=solver))
+                winner = game.play_game(max_rounds=100)
+                
+                random.seed(seed)
+                vectorized = VectorizedMixedGame()
+                vectorized.add_players(ExpectedValuePlayer("EV"))
+                for solver, count in seats:
+                    vectorized.add_players(AIPlayer("AI", solver=solver), count)
+                seat = vectorized.play_game(max_rounds=100)
+                
+                self.assertEqual(vectorized.score.tolist(), [p.score for p in game.players])
+                self.assertIs(game.players[seat] if seat is not None else None, winner)
+    
+    def test_round_initialization(self):
+        """Test that a new round resets every seat."""
+        game = VectorizedMixedGame()
+        game.add_players(SafePlayer("Safe"), 100)
+        game.start_new_round()
+        self.assertEqual(len(game.round_spinner), 12)
+        self.assertTrue(game.active.all())
+        self.assertTrue((game.bank == game.target_num).all())
+    
+    def test_ai_guesses_per_seat(self):
+        """Test that AI seats with different scores get their own decisions."""
+        solver = PushYourLuckSolver()
+        numbers = [1, 2, 3, 4, 5, 6, 8, 9, 10, 11, 12, 13]
+        solver.q_table[solver.get_state_key(0, 7, 7, numbers)] = {'higher': 5, 'lower': 1, 'bank': 0}
+        solver.q_table[solver.get_state_key(10, 7, 7, numbers)] = {'higher': 0, 'lower': 5, 'bank': 1}
+        solver.q_table[solver.get_state_key(20, 7, 7, numbers)] = {'higher': 0, 'lower': 1, 'bank': 5}
+        
+        game = VectorizedMixedGame()
+        game.add_players(AIPlayer("AI", solver=solver), 6)
+        game.add_players(SafePlayer("Safe"), 2)
+        game.score[:6] = [0, 10, 20, 0, 10, 20]
+        game.round_spinner = numbers
+        game.remaining = RemainingIndex(numbers)
+        game.target_num = 7
+        game.bank[:] = 7
+        game.active[:] = True
+        game.active[5] = False
+        
+        guesses = game.get_guesses().tolist()
+        self.assertEqual(guesses[:5], [HIGHER, LOWER, BANK, HIGHER, LOWER])
+        self.assertEqual(guesses[6:], [BANK, BANK])
+    
+    def test_large_table(self):
+        """Test a table with hundreds of seats."""
+        random.seed(1)
+        game = VectorizedMixedGame()
+        game.add_players(SafePlayer("Safe"), 200)
+        game.add_players(ExpectedValuePlayer("EV"), 200)
+        winner = game.play_game()
+        self.assertIsNotNone(winner)
+        self.assertGreaterEqual(game.score[winner], 100)
+        self.assertIn("#", game.player_name(winner))
+
+if __name__ == '__main__':
+    unittest.main()